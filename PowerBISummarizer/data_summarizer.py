@@ -3,6 +3,7 @@ import os
 import re
 import traceback
 from datetime import datetime
+from functools import lru_cache
 from io import BytesIO
 from typing import Dict, Optional
 
@@ -115,14 +116,20 @@ def find_common_field_values(
     return matches
 
 
+@lru_cache(maxsize=None)
+def _read_stylesheet(path: str) -> str:
+    """Conteúdo de um arquivo .qss, lido do disco uma única vez por sessão."""
+    with open(path, "r", encoding="utf-8") as handler:
+        return handler.read()
+
+
 def __apply_theme_once(target):
     """Tenta aplicar o stylesheet do plugin uma única vez."""
     try:
         base_dir = os.path.dirname(__file__)
         qss_path = os.path.join(base_dir, "resources", "style.qss")
         if os.path.exists(qss_path):
-            with open(qss_path, "r", encoding="utf-8") as handler:
-                qss = handler.read()
+            qss = _read_stylesheet(qss_path)
             if hasattr(target, "iface") and hasattr(target.iface, "mainWindow"):
                 target.iface.mainWindow().setStyleSheet(qss)
             elif hasattr(target, "setStyleSheet"):
@@ -308,21 +315,11 @@ class PowerBISummarizerDialog(QDialog):
                 scope.setProperty("squareScope", True)
                 self._square_scopes.append(scope)
         self._square_theme_applied = False
-        try:
-            self.ui.minimize_btn.clicked.connect(self.showMinimized)
-            self.ui.maximize_btn.clicked.connect(self.toggle_window_state)
-        except Exception:
-            pass
 
         # External integration state (not used in main dialog anymore)
         self.external_df = None
         self.external_last_path_key = "PowerBISummarizer/external/lastPath"
 
-        logo_path = os.path.join(
-            os.path.dirname(__file__), "resources", "icons", "plugin_logo.svg"
-        )
-        self.setWindowIcon(QIcon(logo_path))
-
         context = palette_context()
         base_font = QFont(context.get("font_family", "Montserrat"), context.get("font_body_size", 11))
         base_font.setWeight(QFont.Medium)
@@ -406,7 +403,7 @@ class PowerBISummarizerDialog(QDialog):
         self.load_layers()
         self.apply_styles()
         self.on_export_format_changed()
-        self.setup_compare_controls()
+        self._compare_controls_ready = False
 
         try:
             self.show_summary_prompt()
@@ -415,6 +412,11 @@ class PowerBISummarizerDialog(QDialog):
 
         self.integration_panel = None
         self.integration_scroll = None
+
+    def _ensure_integration_panel(self):
+        """Builds the integration hub the first time its page is opened."""
+        if self.integration_panel is not None or self.integration_scroll is not None:
+            return
         try:
             layout = self.ui.pageIntegracao.layout()
             if layout is None:
@@ -444,21 +446,14 @@ class PowerBISummarizerDialog(QDialog):
                 manage_btn.clicked.connect(panel.open_connections_manager)
         except Exception:
             self.integration_panel = None
-    def toggle_window_state(self):
-        if self.isMaximized():
-            self.showNormal()
-            try:
-                self.ui.maximize_btn.setText("Max")
-                self.ui.maximize_btn.setToolTip("Maximizar")
-            except Exception:
-                pass
-        else:
-            self.showMaximized()
-            try:
-                self.ui.maximize_btn.setText("Res")
-                self.ui.maximize_btn.setToolTip("Restaurar")
-            except Exception:
-                pass
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._compare_controls_ready:
+            # Filtering the compare layer combos and binding their field combos
+            # waits until the first frame is painted.
+            self._compare_controls_ready = True
+            QTimer.singleShot(0, self.setup_compare_controls)
 
     def apply_styles(self):
         """Aplica stylesheets personalizados, se existirem."""
@@ -470,14 +465,12 @@ class PowerBISummarizerDialog(QDialog):
         try:
             from string import Template
 
-            with open(style_path, "r", encoding="utf-8") as handler:
-                template = Template(handler.read())
+            template = Template(_read_stylesheet(style_path))
             context = palette_context()
             self.setStyleSheet(template.safe_substitute(context))
         except Exception:
             try:
-                with open(style_path, "r", encoding="utf-8") as handler:
-                    self.setStyleSheet(handler.read())
+                self.setStyleSheet(_read_stylesheet(style_path))
             except Exception:
                 pass
         self._apply_square_theme()
@@ -491,8 +484,7 @@ class PowerBISummarizerDialog(QDialog):
         if not os.path.exists(square_path):
             return
         try:
-            with open(square_path, "r", encoding="utf-8") as handler:
-                square_qss = handler.read()
+            square_qss = _read_stylesheet(square_path)
         except Exception:
             return
         existing = self.styleSheet() or ""
@@ -805,6 +797,7 @@ class PowerBISummarizerDialog(QDialog):
             btn.setVisible(bool(visible))
 
     def show_integration_page(self):
+        self._ensure_integration_panel()
         try:
             self.ui.stackedWidget.setCurrentWidget(self.ui.pageIntegracao)
         except Exception:
@@ -975,6 +968,12 @@ class PowerBISummarizerDialog(QDialog):
         ]
         for combo in combos:
             combo.setFilters(QgsMapLayerProxyModel.VectorLayer)
+        for combo in (
+            self.ui.compare_source_field_combo,
+            self.ui.compare_target_field_combo,
+            self.ui.compare_return_field_combo,
+        ):
+            combo.setFilters(QgsFieldProxyModel.AllTypes)
 
         self.on_compare_source_layer_changed()
         self.on_compare_target_layer_changed()
@@ -982,14 +981,11 @@ class PowerBISummarizerDialog(QDialog):
     def on_compare_source_layer_changed(self):
         layer = self.ui.compare_source_layer_combo.currentLayer()
         self.ui.compare_source_field_combo.setLayer(layer)
-        self.ui.compare_source_field_combo.setFilters(QgsFieldProxyModel.AllTypes)
 
     def on_compare_target_layer_changed(self):
         layer = self.ui.compare_target_layer_combo.currentLayer()
         self.ui.compare_target_field_combo.setLayer(layer)
-        self.ui.compare_target_field_combo.setFilters(QgsFieldProxyModel.AllTypes)
         self.ui.compare_return_field_combo.setLayer(layer)
-        self.ui.compare_return_field_combo.setFilters(QgsFieldProxyModel.AllTypes)
 
     def execute_layer_comparison(self):
         layer_a = self.ui.compare_source_layer_combo.currentLayer()
@@ -1,9 +1,9 @@
-﻿from functools import partial
-from typing import Dict, List, Optional
+﻿import os
+from functools import lru_cache, partial
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-from pandas.api import types as ptypes
 from qgis.PyQt.QtCore import Qt, QSortFilterProxyModel, QRegExp, QVariant
 from qgis.PyQt.QtGui import QFont, QStandardItem, QStandardItemModel
 from qgis.PyQt.QtWidgets import (
@@ -23,6 +23,7 @@ from qgis.PyQt.QtWidgets import (
     QScrollArea,
     QSizePolicy,
     QSplitter,
+    QStyledItemDelegate,
     QTableView,
     QVBoxLayout,
     QWidget,
@@ -39,6 +40,123 @@ from qgis.core import (
 
 from .palette import TYPOGRAPHY
 
+try:  # pragma: no cover - pyarrow is optional inside QGIS
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+except ImportError:  # pragma: no cover
+    pa = None
+    pa_csv = None
+
+try:  # pragma: no cover - xlsxwriter is optional inside QGIS
+    import xlsxwriter  # noqa: F401
+
+    _EXCEL_ENGINE = "xlsxwriter"
+except ImportError:  # pragma: no cover
+    _EXCEL_ENGINE = None
+
+try:  # pragma: no cover - pyogrio is optional inside QGIS
+    import pyogrio
+except ImportError:  # pragma: no cover
+    pyogrio = None
+
+try:  # pragma: no cover - GDAL bindings ship with QGIS but may be absent
+    from osgeo import ogr
+except ImportError:  # pragma: no cover
+    ogr = None
+
+# Object columns are cast to ``category`` only for frames big enough to pay
+# off and when values repeat often enough.
+CATEGORY_MIN_ROWS = 1000
+CATEGORY_MAX_RATIO = 0.5
+
+# Exact-type dispatch for values QGIS cannot take as-is (numpy scalars left in
+# object columns, pandas timestamps). Keyed on ``type(value)`` so the hot loop
+# does a single dict lookup instead of an isinstance cascade. np.float64 is a
+# float subclass that PyQt accepts directly, so it is deliberately absent.
+_ATTRIBUTE_CONVERTERS = {
+    np.float32: float,
+    np.float16: float,
+    np.int64: int,
+    np.int32: int,
+    np.int16: int,
+    np.int8: int,
+    np.uint64: int,
+    np.uint32: int,
+    np.uint16: int,
+    np.uint8: int,
+    np.bool_: bool,
+    pd.Timestamp: lambda value: value.to_pydatetime(),
+}
+
+
+def _convert_object_value(value):
+    converter = _ATTRIBUTE_CONVERTERS.get(type(value))
+    return converter(value) if converter is not None else value
+
+
+def _convert_datetime_value(value):
+    return None if value is None else value.to_pydatetime()
+
+
+@lru_cache(maxsize=None)
+def _qvariant_for_kind(kind: str) -> QVariant.Type:
+    if kind in "iu":
+        return QVariant.LongLong
+    if kind == "f":
+        return QVariant.Double
+    if kind == "M":
+        return QVariant.DateTime
+    if kind == "b":
+        return QVariant.Bool
+    return QVariant.String
+
+
+# Rows converted per block when exporting through the QGIS memory layer.
+EXPORT_CHUNK_ROWS = 10_000
+
+
+def _convert_chunk(block: np.ndarray, convert_row) -> List[list]:
+    """Attribute lists for a block of rows; pure so blocks stay independent."""
+    # ndarray.tolist() unpacks the whole 2-D block in NumPy's C loop.
+    rows = block.tolist()
+    if convert_row is None:
+        return rows
+    return [convert_row(row) for row in rows]
+
+
+def _converter_for_kind(kind: str):
+    """Per-column cell converter, or None when values are already native."""
+    if kind in "iufb":
+        return None
+    if kind == "M":
+        return _convert_datetime_value
+    return _convert_object_value
+
+
+@lru_cache(maxsize=64)
+def _compile_row_converter(kinds: Tuple[str, ...]):
+    """
+    Generate a branch-free row converter specialised for a column schema.
+
+    The result is cached per tuple of dtype kinds, so repeated exports of the
+    same pivot layout reuse it. Returns None when no column needs conversion.
+    """
+    namespace = {}
+    cells = []
+    for position, kind in enumerate(kinds):
+        converter = _converter_for_kind(kind)
+        if converter is None:
+            cells.append(f"row[{position}]")
+        else:
+            name = f"_convert_{position}"
+            namespace[name] = converter
+            cells.append(f"{name}(row[{position}])")
+    if not namespace:
+        return None
+    source = "def convert_row(row):\n    return [" + ", ".join(cells) + "]\n"
+    exec(source, namespace)
+    return namespace["convert_row"]
+
 
 class _PivotFilterProxy(QSortFilterProxyModel):
     """Proxy that supports global search plus per-column filters."""
@@ -91,6 +209,23 @@ class _PivotFilterProxy(QSortFilterProxyModel):
         self.invalidateFilter()
 
 
+class _ColumnAlignDelegate(QStyledItemDelegate):
+    """Delegate that aligns every cell of a column from a precomputed list."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._alignments: List[int] = []
+
+    def set_alignments(self, alignments: List[int]):
+        self._alignments = list(alignments)
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        column = index.column()
+        if 0 <= column < len(self._alignments):
+            option.displayAlignment = self._alignments[column]
+
+
 class PivotTableWidget(QWidget):
     """Excel-inspired compact pivot table with column filters and field list."""
 
@@ -103,7 +238,9 @@ class PivotTableWidget(QWidget):
         ("Desvio padrao", "std"),
     ]
 
-    EXPORT_FILTERS = "CSV (*.csv);;Excel (*.xlsx);;GeoPackage (*.gpkg)"
+    EXPORT_FILTERS = "CSV (*.csv);;Excel (*.xlsx);;GeoPackage (*.gpkg)" + (
+        ";;Parquet (*.parquet)" if pa is not None else ""
+    )
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -189,6 +326,8 @@ class PivotTableWidget(QWidget):
         self.table_view.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.table_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.table_view.horizontalHeader().setStretchLastSection(True)
+        self._align_delegate = _ColumnAlignDelegate(self.table_view)
+        self.table_view.setItemDelegate(self._align_delegate)
         left_layout.addWidget(self.table_view, stretch=1)
 
         self.status_label = QLabel("")
@@ -326,6 +465,7 @@ class PivotTableWidget(QWidget):
             rows = raw.get("rows") or []
 
             df = pd.DataFrame(rows, columns=columns) if columns else pd.DataFrame(rows)
+            df = self._categorize_low_cardinality(df)
             self.raw_df = df
             self.filtered_df = df
             self.column_dtypes = {col: str(df[col].dtype) for col in df.columns}
@@ -362,12 +502,6 @@ class PivotTableWidget(QWidget):
             self.row_field_combo,
             self.value_field_combo,
         ]
-        for combo in combos:
-            combo.blockSignals(True)
-            combo.clear()
-            combo.addItem("(Nenhum)", None)
-            combo.blockSignals(False)
-
         for column in df.columns:
             item = QListWidgetItem(column)
             item.setData(Qt.UserRole, column)
@@ -376,8 +510,17 @@ class PivotTableWidget(QWidget):
             else:
                 item.setData(Qt.UserRole + 1, False)
             self.fields_list.addItem(item)
-            for combo in combos:
-                combo.addItem(column, column)
+
+        columns = list(df.columns)
+        labels = [str(column) for column in columns]
+        for combo in combos:
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItem("(Nenhum)", None)
+            combo.addItems(labels)
+            for index, column in enumerate(columns, start=1):
+                combo.setItemData(index, column)
+            combo.blockSignals(False)
 
         # Default selections
         if df.columns.size:
@@ -435,7 +578,10 @@ class PivotTableWidget(QWidget):
 
         if agg_func != "count" and metric not in self.numeric_candidates:
             try:
-                df[metric] = pd.to_numeric(df[metric], errors="coerce")
+                series = df[metric]
+                if isinstance(series.dtype, pd.CategoricalDtype):
+                    series = series.astype(object)
+                df[metric] = pd.to_numeric(series, errors="coerce")
             except Exception:
                 pass
 
@@ -456,6 +602,7 @@ class PivotTableWidget(QWidget):
                 values=metric,
                 aggfunc=agg_func,
                 dropna=False,
+                observed=True,
             )
             pivot = pivot.reset_index()
             if agg_func != "count":
@@ -465,17 +612,19 @@ class PivotTableWidget(QWidget):
             self.pivot_df = pivot
             return
 
-        grouped = df.groupby(row_field)[metric].agg(agg_func)
+        grouped = df.groupby(row_field, observed=True)[metric].agg(agg_func)
         pivot = grouped.reset_index()
         header = f"{agg_func.upper()}({metric})" if agg_func != "count" else f"COUNT({metric})"
         pivot.columns = [row_field, header]
         if agg_func != "count":
             pivot[header] = pivot[header].round(2)
+        values = pivot[header].to_numpy(dtype=float)
         if agg_func in ("sum", "count"):
-            total = pivot[header].sum()
+            total = np.nansum(values)
             if total:
-                pivot["% do total"] = (pivot[header] / total * 100).round(2)
-        pivot = pivot.sort_values(by=header, ascending=False).reset_index(drop=True)
+                pivot["% do total"] = np.round(values * (100.0 / total), 2)
+        order = np.argsort(-values, kind="stable")
+        pivot = pivot.iloc[order].reset_index(drop=True)
         self.pivot_df = pivot
 
     def _populate_table(self):
@@ -490,11 +639,20 @@ class PivotTableWidget(QWidget):
         headers = list(self.pivot_df.columns)
         self.table_model.setHorizontalHeaderLabels(headers)
 
-        base_font = QFont(TYPOGRAPHY.get("font_family", "Montserrat"), TYPOGRAPHY.get("font_body_size", 12))
-        base_font.setWeight(QFont.Medium)
-        for row in self.pivot_df.itertuples(index=False, name=None):
+        # Font comes from the view (_apply_theming_tokens) and alignment from the
+        # column delegate, so cells only carry their text.
+        self._align_delegate.set_alignments(
+            [
+                Qt.AlignRight | Qt.AlignVCenter
+                if dtype.kind in "iuf"
+                else Qt.AlignLeft | Qt.AlignVCenter
+                for dtype in self.pivot_df.dtypes
+            ]
+        )
+        values = self.pivot_df.to_numpy(dtype=object)
+        for row_index in range(values.shape[0]):
             items = []
-            for value in row:
+            for value in values[row_index]:
                 if pd.isna(value):
                     text = ""
                 elif isinstance(value, (float, np.floating)):
@@ -503,11 +661,6 @@ class PivotTableWidget(QWidget):
                     text = str(value)
                 item = QStandardItem(text)
                 item.setEditable(False)
-                item.setFont(base_font)
-                if isinstance(value, (float, np.floating, int, np.integer)):
-                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-                else:
-                    item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
                 items.append(item)
             self.table_model.appendRow(items)
 
@@ -718,11 +871,30 @@ class PivotTableWidget(QWidget):
         return result
 
     def _is_numeric_column(self, series: pd.Series) -> bool:
-        if ptypes.is_numeric_dtype(series):
+        if series.dtype.kind in "biufc":
             return True
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.cat.categories.to_series()
         converted = pd.to_numeric(series, errors="coerce")
         return converted.notna().any()
 
+    @staticmethod
+    def _categorize_low_cardinality(df: pd.DataFrame) -> pd.DataFrame:
+        """Store repetitive text columns as categoricals to shrink groupby work."""
+        if len(df) <= CATEGORY_MIN_ROWS:
+            return df
+        converted = None
+        for column in df.select_dtypes(include="object").columns:
+            try:
+                unique_count = df[column].nunique(dropna=True)
+            except TypeError:
+                continue
+            if unique_count and unique_count / len(df) < CATEGORY_MAX_RATIO:
+                if converted is None:
+                    converted = df.copy(deep=False)
+                converted[column] = df[column].astype("category")
+        return df if converted is None else converted
+
     # ------------------------------------------------------------------ Export
     def _export_pivot_table(self):
         if self.pivot_df is None or self.pivot_df.empty:
@@ -744,11 +916,19 @@ class PivotTableWidget(QWidget):
             if "csv" in selected_filter.lower():
                 if not path.lower().endswith(".csv"):
                     path += ".csv"
-                self.pivot_df.to_csv(path, index=False)
+                self._write_csv(self.pivot_df, path)
             elif "xlsx" in selected_filter.lower():
                 if not path.lower().endswith(".xlsx"):
                     path += ".xlsx"
-                self.pivot_df.to_excel(path, index=False)
+                self._write_excel(self.pivot_df, path)
+            elif "parquet" in selected_filter.lower():
+                if not path.lower().endswith(".parquet"):
+                    path += ".parquet"
+                # Pivot results carry no geometry, so a columnar file skips the
+                # OGR/SQLite round trip entirely.
+                self.pivot_df.rename(columns=str).to_parquet(
+                    path, index=False, compression="zstd"
+                )
             else:
                 if not path.lower().endswith(".gpkg"):
                     path += ".gpkg"
@@ -767,6 +947,26 @@ class PivotTableWidget(QWidget):
             f"Tabela dinamica exportada para:\n{path}",
         )
 
+    @staticmethod
+    def _write_csv(df: pd.DataFrame, path: str):
+        if pa_csv is not None:
+            try:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+            except pa.ArrowException:
+                # Mixed-type object columns cannot be converted; use pandas.
+                table = None
+            if table is not None:
+                pa_csv.write_csv(table, path)
+                return
+        df.to_csv(path, index=False)
+
+    @staticmethod
+    def _write_excel(df: pd.DataFrame, path: str):
+        if _EXCEL_ENGINE == "xlsxwriter":
+            df.to_excel(path, index=False, engine="xlsxwriter")
+            return
+        df.to_excel(path, index=False)
+
     def _export_to_gpkg(self, path: str):
         df = self.pivot_df
         layer_name = self._current_metadata.get("layer_name") or "tabela_dinamica"
@@ -774,38 +974,54 @@ class PivotTableWidget(QWidget):
             ch if ch.isalnum() or ch in ("-", "_") else "_" for ch in layer_name
         )
 
+        if self._write_gpkg_columnar(df, path, safe_name):
+            return
+
         memory_layer = QgsVectorLayer("None", safe_name, "memory")
         provider = memory_layer.dataProvider()
 
+        variant_types = tuple(
+            self._map_dtype_to_qvariant(df[column]) for column in df.columns
+        )
         fields = QgsFields()
-        for column in df.columns:
-            variant_type = self._map_dtype_to_qvariant(df[column])
-            fields.append(QgsField(column, variant_type))
+        append_field = fields.append
+        for column, variant_type in zip(df.columns, variant_types):
+            append_field(QgsField(str(column), variant_type))
         provider.addAttributes(fields)
         memory_layer.updateFields()
 
-        features = []
-        for row in df.itertuples(index=False, name=None):
-            feature = QgsFeature()
-            feature.setFields(fields)
-            attrs = []
-            for value in row:
-                if isinstance(value, (float, np.floating)):
-                    attrs.append(float(value) if not pd.isna(value) else None)
-                elif isinstance(value, (int, np.integer)):
-                    attrs.append(int(value))
-                elif pd.isna(value):
-                    attrs.append(None)
-                else:
-                    attrs.append(value)
-            feature.setAttributes(attrs)
-            features.append(feature)
-        provider.addFeatures(features)
+        kinds = tuple(dtype.kind for dtype in df.dtypes)
+        if all(kind in "iufb" for kind in kinds) and not df.isna().to_numpy().any():
+            # Typical numeric pivot: a structured array unpacks straight into
+            # native int/float tuples, which only need to become lists.
+            values = df.to_records(index=False)
+            convert_row = list
+        else:
+            # Box to Python objects and turn NaN/NaT into None in a single
+            # C-level cast; int64/float64 columns come out as plain int/float.
+            values = df.to_numpy(dtype=object, na_value=None)
+            # Columns are homogeneous, so the row converter is specialised once
+            # per schema (dtype kinds) and reused across exports.
+            convert_row = _compile_row_converter(kinds)
+
+        # The provider copies what it receives, so one pool of field-bound
+        # features (at most a block long) is refilled for every block instead
+        # of allocating a QgsFeature per row. Only one block is alive at a time.
+        pool = [QgsFeature(fields) for _ in range(min(EXPORT_CHUNK_ROWS, len(values)))]
+        for start in range(0, len(values), EXPORT_CHUNK_ROWS):
+            block = values[start:start + EXPORT_CHUNK_ROWS]
+            rows = _convert_chunk(block, convert_row)
+            for feature, attrs in zip(pool, rows):
+                feature.setAttributes(attrs)
+            provider.addFeatures(pool[:len(rows)])
         memory_layer.updateExtents()
 
         options = QgsVectorFileWriter.SaveVectorOptions()
         options.driverName = "GPKG"
         options.layerName = safe_name
+        # Pivot tables have no geometry worth indexing; skipping the R-tree
+        # build is the single biggest saving in the GPKG write.
+        options.layerOptions = ["SPATIAL_INDEX=NO"]
 
         transform_context = QgsProject.instance().transformContext()
         result = QgsVectorFileWriter.writeAsVectorFormatV3(
@@ -814,6 +1030,9 @@ class PivotTableWidget(QWidget):
             transform_context,
             options,
         )
+        # Drop the in-memory copies before returning to the event loop; the
+        # widget lives for the whole session and exports can repeat.
+        values = rows = pool = provider = memory_layer = None
 
         if isinstance(result, tuple):
             status = result[0]
@@ -825,14 +1044,60 @@ class PivotTableWidget(QWidget):
         if status != QgsVectorFileWriter.NoError:
             raise RuntimeError(message or "Falha ao escrever GeoPackage.")
 
+    @staticmethod
+    def _write_gpkg_columnar(df: pd.DataFrame, path: str, layer_name: str) -> bool:
+        """
+        Write the frame in one columnar call through pyogrio/GDAL.
+
+        Returns False when pyogrio is unavailable or rejects the frame so the
+        caller can fall back to the QGIS memory-layer writer.
+        """
+        if pyogrio is not None:
+            try:
+                pyogrio.write_dataframe(
+                    df.rename(columns=str),
+                    path,
+                    driver="GPKG",
+                    layer=layer_name,
+                    SPATIAL_INDEX="NO",
+                )
+            except Exception:
+                pass
+            else:
+                return True
+        return PivotTableWidget._write_gpkg_arrow(df, path, layer_name)
+
+    @staticmethod
+    def _write_gpkg_arrow(df: pd.DataFrame, path: str, layer_name: str) -> bool:
+        """Stream the frame as Arrow record batches into OGR (GDAL >= 3.8)."""
+        if ogr is None or pa is None:
+            return False
+        try:
+            table = pa.Table.from_pandas(df.rename(columns=str), preserve_index=False)
+        except pa.ArrowException:
+            return False
+
+        driver = ogr.GetDriverByName("GPKG")
+        if driver is None:
+            return False
+        if os.path.exists(path):
+            driver.DeleteDataSource(path)
+        dataset = driver.CreateDataSource(path)
+        if dataset is None:
+            return False
+        try:
+            layer = dataset.CreateLayer(layer_name, geom_type=ogr.wkbNone)
+            if layer is None or not hasattr(layer, "WriteArrow"):
+                return False
+            layer.WriteArrow(table)
+            layer = None
+        except Exception:
+            return False
+        finally:
+            # Dropping the reference closes the dataset and flushes it to disk.
+            dataset = None
+        return True
+
     def _map_dtype_to_qvariant(self, series: pd.Series) -> QVariant.Type:
-        if self._is_numeric_column(series):
-            if ptypes.is_integer_dtype(series):
-                return QVariant.LongLong
-            return QVariant.Double
-        if ptypes.is_datetime64_any_dtype(series):
-            return QVariant.DateTime
-        if ptypes.is_bool_dtype(series):
-            return QVariant.Bool
-        return QVariant.String
+        return _qvariant_for_kind(series.dtype.kind)
 
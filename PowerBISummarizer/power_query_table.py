@@ -1,19 +1,25 @@
 ﻿
 import math
-from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+from typing import Callable, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
 
+import numpy as np
 import pandas as pd
 from pandas.api import types as ptypes
 from qgis.PyQt.QtCore import (
     QAbstractTableModel,
     QModelIndex,
+    QObject,
     QPoint,
+    QRunnable,
     Qt,
+    QThreadPool,
     QVariant,
+    pyqtSignal,
 )
 from qgis.PyQt.QtGui import QClipboard, QGuiApplication
 from qgis.PyQt.QtWidgets import (
     QAction,
+    QDialog,
     QFrame,
     QHBoxLayout,
     QLabel,
@@ -35,26 +41,351 @@ from .slim_dialogs import (
     slim_get_item,
     slim_get_text,
 )
+
+try:  # pragma: no cover - pyarrow is optional inside QGIS
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pragma: no cover
+    pa = None
+    pc = None
+
+try:  # pragma: no cover - numba is optional inside QGIS
+    from numba import njit, prange
+except ImportError:  # pragma: no cover
+    njit = None
+    prange = range
 
 PROTECTED_COLUMNS_DEFAULT: Set[str] = {"__feature_id", "__geometry_wkb", "__target_feature_id"}
 NULL_SENTINEL = object()
+FILTER_VALUES_LIMIT = 10_000
+CATEGORY_MIN_ROWS = 10_000
+CATEGORY_MAX_RATIO = 0.5
+FILTER_ASYNC_MIN_ROWS = 200_000
+SORTED_ISIN_MIN_VALUES = 32
+GROUPBY_NUMBA_MIN_ROWS = 200_000
+DISPLAY_MEMO_LIMIT = 20_000
+
+
+_PQ_STYLESHEET = """
+    QFrame#pqRibbon {
+        background-color: #ffffff;
+        border: 1px solid #dfe3ec;
+        border-radius: 0px;
+    }
+    QSplitter#pqSplitter::handle {
+        background-color: #dfe3ec;
+        width: 4px;
+    }
+    QFrame#filterPanel {
+        background-color: #ffffff;
+        border: 1px solid #dfe3ec;
+        border-radius: 0px;
+    }
+    QFrame#tablePanel {
+        background-color: #ffffff;
+        border: 1px solid #dfe3ec;
+        border-radius: 0px;
+        padding: 8px;
+    }
+    QTableView {
+        background-color: #f5f6fa;
+        alternate-background-color: #eef1f8;
+        gridline-color: #d9dce3;
+        selection-background-color: #fff3c2;
+        selection-color: #1d2a4b;
+        border: none;
+    }
+    QTableView::item {
+        padding: 4px 8px;
+    }
+    QHeaderView::section {
+        background-color: #e7ebf5;
+        color: #1d2a4b;
+        font-weight: 600;
+        border: none;
+        border-right: 1px solid #d9dce3;
+        padding: 6px 10px;
+    }
+    QFrame#statusBar {
+        background-color: #ffffff;
+        border-top: 1px solid #dfe3ec;
+    }
+    QFrame#filterBadge {
+        background-color: #f7f9ff;
+        border: 1px solid #d0d8ef;
+        border-radius: 0px;
+    }
+    QFrame#filterBadge QPushButton {
+        border: none;
+        background: transparent;
+        color: #1d2a4b;
+    }
+    QFrame#filterBadge QPushButton:hover {
+        color: #d9534f;
+    }
+"""
+
+
+class _OtherValues:
+    """Filter payload standing for every value left out of a capped checklist."""
+
+    __slots__ = ("listed", "include_missing")
+
+    def __init__(self, listed: List, include_missing: bool):
+        self.listed = listed
+        self.include_missing = include_missing
+
+    def mask(self, series: pd.Series) -> np.ndarray:
+        keep = ~series.isin(self.listed).to_numpy(dtype=bool)
+        if not self.include_missing:
+            keep &= series.notna().to_numpy(dtype=bool)
+        return keep
 
 
 def _display_text(value) -> str:
     if value is NULL_SENTINEL:
         return "(vazio)"
+    if isinstance(value, _OtherValues):
+        return "(outros...)"
     if pd.isna(value):
         return "(vazio)"
     return str(value)
 
 
+def _fast_na_str(value) -> str:
+    """Clipboard text for a scalar, without going through pd.isna."""
+    if value is None or value is pd.NA or value is pd.NaT:
+        return ""
+    if isinstance(value, float) and math.isnan(value):
+        return ""
+    if isinstance(value, (np.datetime64, np.timedelta64)) and np.isnat(value):
+        return ""
+    return str(value)
+
+
+def _format_cell(value) -> str:
+    if ptypes.is_scalar(value) and pd.isna(value):
+        return ""
+    if isinstance(value, float):
+        if math.isfinite(value):
+            return f"{value:,.4f}".rstrip("0").rstrip(".")
+        return ""
+    return str(value)
+
+
+def _unique_display(series: pd.Series):
+    """Distinct non-missing values of ``series`` in first-appearance order."""
+    return pd.unique(series.dropna())
+
+
+def _blank_strings(series: pd.Series) -> np.ndarray:
+    """True where ``series`` holds a string that is empty after stripping."""
+    try:
+        stripped = series.str.strip()
+    except AttributeError:
+        # No string values at all, so nothing can be blank.
+        return np.zeros(len(series.index), dtype=bool)
+    return stripped.eq("").to_numpy(dtype=bool, na_value=False)
+
+
+def _convert_by_unique(series: pd.Series, convert: Callable[[pd.Series], pd.Series]) -> pd.Series:
+    """Apply ``convert`` once per distinct value of a repetitive object column."""
+    if series.dtype != object:
+        return convert(series)
+    codes, uniques = pd.factorize(series)
+    if len(uniques) * 2 > len(series.index):
+        return convert(series)
+    converted = convert(pd.Series(uniques, dtype=object))
+    # An extra missing slot at the end catches the -1 codes of missing rows.
+    converted = converted.reindex(range(len(uniques) + 1))
+    result = converted.take(codes)
+    result.index = series.index
+    return result
+
+
+def _with_column(df: pd.DataFrame, column, values) -> pd.DataFrame:
+    """New frame sharing ``df``'s data with ``column`` set to ``values``."""
+    result = df.copy(deep=False)
+    result[column] = values
+    return result
+
+
+def _is_arrow_dtype(dtype) -> bool:
+    arrow_dtype = getattr(pd, "ArrowDtype", None)
+    return arrow_dtype is not None and isinstance(dtype, arrow_dtype)
+
+
+def _plain_values(series: pd.Series) -> pd.Series:
+    """Object view of a categorical/Arrow column for edits that introduce new values."""
+    if isinstance(series.dtype, pd.CategoricalDtype) or _is_arrow_dtype(series.dtype):
+        return series.astype(object)
+    return series
+
+
+def _format_column(series: pd.Series) -> Optional[np.ndarray]:
+    """Display strings for a whole column when that is cheap, else None.
+
+    Categoricals format each category once and expand through the codes;
+    integer and boolean columns convert in one vectorised pass. Every other
+    column is formatted cell by cell as it is painted.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        text = np.empty(len(categories) + 1, dtype=object)
+        text[:-1] = [_format_cell(value) for value in categories]
+        # The extra slot catches the -1 codes of missing rows.
+        text[-1] = ""
+        return text.take(series.cat.codes.to_numpy())
+    if series.dtype.kind in "iub":
+        text = series.astype(str).to_numpy(dtype=object)
+        missing = series.isna().to_numpy()
+        if missing.any():
+            text[missing] = ""
+        return text
+    return None
+
+
+def _col_set(df: pd.DataFrame) -> frozenset:
+    return frozenset(df.columns)
+
+
+if njit is not None:
+
+    @njit(parallel=True, cache=True)
+    def _sorted_isin_kernel(values, allowed):  # pragma: no cover - compiled
+        out = np.empty(values.shape[0], dtype=np.bool_)
+        last = allowed.shape[0]
+        for i in prange(values.shape[0]):
+            pos = np.searchsorted(allowed, values[i])
+            out[i] = pos < last and allowed[pos] == values[i]
+        return out
+
+else:
+    _sorted_isin_kernel = None
+
+
+def _numeric_isin(series: pd.Series, allowed_values: List) -> Optional[np.ndarray]:
+    """Membership test by binary search for plain numeric columns.
+
+    Returns None when the column or the values are not plain numbers, in
+    which case the caller falls back to ``Series.isin``.
+    """
+    if len(allowed_values) <= SORTED_ISIN_MIN_VALUES:
+        return None
+    if not isinstance(series.dtype, np.dtype) or series.dtype.kind not in "iuf":
+        return None
+    allowed = np.asarray(allowed_values)
+    if allowed.dtype.kind not in "iuf":
+        return None
+    common = np.result_type(series.dtype, allowed.dtype)
+    values = series.to_numpy(dtype=common)
+    allowed = np.unique(allowed.astype(common))
+    if _sorted_isin_kernel is not None:
+        return _sorted_isin_kernel(values, allowed)
+    positions = np.searchsorted(allowed, values).clip(max=len(allowed) - 1)
+    return allowed[positions] == values
+
+
+def _categorical_isin(series: pd.Series, allowed_values: List) -> Optional[np.ndarray]:
+    """Membership test on category codes, so no row value is hashed."""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return None
+    try:
+        selected = series.cat.categories.get_indexer(allowed_values)
+    except TypeError:
+        return None
+    codes = series.cat.codes.to_numpy()
+    # Categories are few, so a lookup table beats hashing the codes.
+    lookup = np.zeros(len(series.cat.categories) + 1, dtype=bool)
+    lookup[selected[selected >= 0]] = True
+    return lookup[codes]
+
+
+def _filter_mask(source: pd.DataFrame, filters: Dict[str, List]) -> np.ndarray:
+    mask = np.ones(len(source.index), dtype=bool)
+    columns = _col_set(source)
+    for column, values in filters.items():
+        if column not in columns:
+            continue
+        series = source[column]
+        allowed_values = [
+            val for val in values if val is not NULL_SENTINEL and not isinstance(val, _OtherValues)
+        ]
+        if allowed_values:
+            keep = _categorical_isin(series, allowed_values)
+            if keep is None:
+                keep = _numeric_isin(series, allowed_values)
+            if keep is None:
+                keep = series.isin(allowed_values).to_numpy(dtype=bool)
+        else:
+            keep = np.zeros(len(mask), dtype=bool)
+        if any(val is NULL_SENTINEL for val in values):
+            keep |= series.isna().to_numpy(dtype=bool)
+        for val in values:
+            if isinstance(val, _OtherValues):
+                keep |= val.mask(series)
+        mask &= keep
+    return mask
+
+
+class _FilterSignals(QObject):
+    finished = pyqtSignal(int, object)
+
+
+class _FilterTask(QRunnable):
+    """Computes a filter mask on a worker thread and reports back by ticket."""
+
+    def __init__(self, ticket: int, source: pd.DataFrame, filters: Dict[str, List], signals: _FilterSignals):
+        super().__init__()
+        self._ticket = ticket
+        self._source = source
+        self._filters = filters
+        self._signals = signals
+
+    def run(self):
+        try:
+            result = _filter_mask(self._source, self._filters)
+        except Exception as exc:
+            result = exc
+        try:
+            self._signals.finished.emit(self._ticket, result)
+        except RuntimeError:
+            # The table was closed while the task was running.
+            pass
+
+
+_COMPARABLE_INFERRED_TYPES = frozenset(
+    {"string", "bytes", "integer", "floating", "mixed-integer-float", "decimal", "boolean", "datetime", "date"}
+)
+
+
+def _stable_order(values: np.ndarray, ascending: bool, keys: Optional[np.ndarray] = None) -> np.ndarray:
+    """Stable argsort of ``values`` (or ``keys``) with missing entries always last."""
+    missing = np.asarray(pd.isna(values), dtype=bool)
+    present = np.flatnonzero(~missing)
+    keys = (values if keys is None else keys)[present]
+    if ascending:
+        order = np.argsort(keys, kind="stable")
+    else:
+        # Sorting the reversed keys keeps ties in their original order.
+        order = (len(keys) - 1 - np.argsort(keys[::-1], kind="stable"))[::-1]
+    return np.concatenate([present[order], np.flatnonzero(missing)])
+
+
 class PowerQueryModel(QAbstractTableModel):
     def __init__(self, df: Optional[pd.DataFrame] = None, parent: Optional[QWidget] = None):
         super().__init__(parent)
-        self._df: pd.DataFrame = df.copy() if df is not None else pd.DataFrame()
+        self._df: pd.DataFrame = df if df is not None else pd.DataFrame()
         self._visible_columns: List[str] = list(self._df.columns)
         self._sort_column: int = -1
         self._sort_order: Qt.SortOrder = Qt.AscendingOrder
+        self._col_arrays: Dict[str, np.ndarray] = {}
+        self._column_text: Dict[int, Optional[np.ndarray]] = {}
+        self._cell_memo: Dict[Tuple[int, int], str] = {}
+        self._row_perm: np.ndarray = np.empty(0, dtype=np.intp)
+        self._header_labels: List = []
+        self._rebuild_caches()
+        self._refresh_header_labels()
 
     @property
     def dataframe(self) -> pd.DataFrame:
@@ -66,15 +397,66 @@ class PowerQueryModel(QAbstractTableModel):
 
     def set_dataframe(self, df: pd.DataFrame, visible_columns: Optional[Sequence[str]] = None):
         self.beginResetModel()
-        self._df = df.copy()
+        self._df = df
         if visible_columns is None:
             self._visible_columns = list(self._df.columns)
         else:
-            self._visible_columns = [col for col in visible_columns if col in self._df.columns]
+            columns = _col_set(self._df)
+            self._visible_columns = [col for col in visible_columns if col in columns]
         self._sort_column = -1
         self._sort_order = Qt.AscendingOrder
+        self._rebuild_caches()
+        self._refresh_header_labels()
         self.endResetModel()
 
+    def _refresh_header_labels(self):
+        labels = list(self._visible_columns)
+        if 0 <= self._sort_column < len(labels):
+            arrow = " v" if self._sort_order == Qt.AscendingOrder else " ^"
+            labels[self._sort_column] = f"{labels[self._sort_column]}{arrow}"
+        self._header_labels = labels
+
+    def _rebuild_caches(self):
+        self._col_arrays = {column: self._df[column].to_numpy() for column in self._visible_columns}
+        # Display text is produced on first paint; see _cell_text.
+        self._column_text = {}
+        self._cell_memo = {}
+        self._row_perm = np.arange(len(self._df.index), dtype=np.intp)
+
+    def _cell_text(self, row: int, position: int) -> str:
+        """Display string of source row ``row`` in visible column ``position``."""
+        try:
+            text = self._column_text[position]
+        except KeyError:
+            column = self._visible_columns[position]
+            text = self._column_text[position] = _format_column(self._df[column])
+        if text is not None:
+            return text[row]
+        key = (row, position)
+        cached = self._cell_memo.get(key)
+        if cached is None:
+            if len(self._cell_memo) >= DISPLAY_MEMO_LIMIT:
+                self._cell_memo.clear()
+            value = self._col_arrays[self._visible_columns[position]][row]
+            cached = self._cell_memo[key] = _format_cell(value)
+        return cached
+
+    def source_row(self, row: int) -> int:
+        """Position in ``dataframe`` of the row shown at ``row``."""
+        return int(self._row_perm[row])
+
+    def row_values(self, row: int) -> np.ndarray:
+        """Raw values of source row ``row`` across the visible columns."""
+        values = np.empty(len(self._visible_columns), dtype=object)
+        values[:] = [self._col_arrays[column][row] for column in self._visible_columns]
+        return values
+
+    def raw_value(self, index: QModelIndex):
+        if not index.isValid():
+            return None
+        column = self._visible_columns[index.column()]
+        return self._col_arrays[column][self._row_perm[index.row()]]
+
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
         if parent.isValid():
             return 0
@@ -87,31 +469,29 @@ class PowerQueryModel(QAbstractTableModel):
 
     def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
         if not index.isValid():
-            return QVariant()
-        if role not in (Qt.DisplayRole, Qt.EditRole):
-            return QVariant()
-        column = self._visible_columns[index.column()]
-        try:
-            value = self._df.iloc[index.row()][column]
-        except Exception:
-            return ""
-        if pd.isna(value):
-            return ""
-        if isinstance(value, float):
-            if math.isfinite(value):
-                return f"{value:,.4f}".rstrip("0").rstrip(".")
-            return ""
-        return str(value)
+            return None
+        if role == Qt.DisplayRole:
+            return self._cell_text(int(self._row_perm[index.row()]), index.column())
+        if role == Qt.EditRole:
+            value = self.raw_value(index)
+            if not ptypes.is_scalar(value):
+                # List/dict cells from connectors: hand out their display text.
+                return _format_cell(value)
+            if pd.isna(value):
+                return None
+            # .item() would turn datetime64[ns]/timedelta64[ns] into plain integers.
+            if isinstance(value, np.datetime64):
+                return pd.Timestamp(value)
+            if isinstance(value, np.timedelta64):
+                return pd.Timedelta(value)
+            return value.item() if isinstance(value, np.generic) else value
+        return None
 
     def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):
         if role != Qt.DisplayRole or orientation != Qt.Horizontal:
             return super().headerData(section, orientation, role)
-        if 0 <= section < len(self._visible_columns):
-            label = self._visible_columns[section]
-            if section == self._sort_column:
-                arrow = " v" if self._sort_order == Qt.AscendingOrder else " ^"
-                return f"{label}{arrow}"
-            return label
+        if 0 <= section < len(self._header_labels):
+            return self._header_labels[section]
         return QVariant()
 
     def sort(self, column: int, order: Qt.SortOrder = Qt.AscendingOrder):
@@ -121,17 +501,63 @@ class PowerQueryModel(QAbstractTableModel):
         if col_name not in self._df.columns:
             return
         self.layoutAboutToBeChanged.emit()
-        try:
-            ascending = order == Qt.AscendingOrder
-            self._df = self._df.sort_values(by=col_name, ascending=ascending, kind="mergesort")
-        except Exception:
-            converted = self._df[col_name].astype(str)
-            self._df = self._df.assign(_sort_key_=converted)
-            self._df = self._df.sort_values(by="_sort_key_", ascending=order == Qt.AscendingOrder, kind="mergesort")
-            self._df = self._df.drop(columns="_sort_key_")
-        self._df.reset_index(drop=True, inplace=True)
+        # Only the row permutation changes; the dataframe and caches stay put.
+        self._row_perm = self._sort_positions(col_name, order)
         self._sort_column = column
         self._sort_order = order
+        self._refresh_header_labels()
+        self.layoutChanged.emit()
+
+    def _sort_positions(self, col_name: str, order: Qt.SortOrder) -> np.ndarray:
+        ascending = order == Qt.AscendingOrder
+        series = self._df[col_name]
+        values = self._col_arrays[col_name]
+        ranks = None
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            ranks = self._category_ranks(series.cat.categories)
+        if ranks is not None:
+            codes = series.cat.codes.to_numpy()
+            present = codes >= 0
+            keys = np.full(len(codes), np.nan)
+            keys[present] = ranks[codes[present]]
+            positions = _stable_order(keys, ascending)
+        elif ptypes.is_numeric_dtype(series.dtype) or ptypes.is_datetime64_any_dtype(series.dtype):
+            positions = _stable_order(values, ascending)
+        elif ptypes.infer_dtype(values, skipna=True) in _COMPARABLE_INFERRED_TYPES:
+            positions = _stable_order(values, ascending)
+        else:
+            # Mixed object columns cannot be compared directly; order by text.
+            text = np.array([str(value) for value in values], dtype=object)
+            positions = _stable_order(values, ascending, keys=text)
+        return positions.astype(np.intp, copy=False)
+
+    @staticmethod
+    def _category_ranks(categories: pd.Index) -> Optional[np.ndarray]:
+        """Sort rank of each category, or None when they cannot be compared."""
+        try:
+            if categories.is_monotonic_increasing:
+                return np.arange(len(categories), dtype=np.float64)
+            order = np.argsort(categories.to_numpy(), kind="stable")
+        except TypeError:
+            # Mixed-type categories keep first-appearance order; sort by text instead.
+            return None
+        ranks = np.empty(len(categories), dtype=np.float64)
+        ranks[order] = np.arange(len(categories), dtype=np.float64)
+        return ranks
+
+    def update_rows(self, df: pd.DataFrame):
+        """Swap in a frame with the same columns, keeping the header and sort."""
+        columns = _col_set(df)
+        if any(column not in columns for column in self._visible_columns):
+            self.set_dataframe(df, self._visible_columns)
+            return
+        self.layoutAboutToBeChanged.emit()
+        stale = self.persistentIndexList()
+        self.changePersistentIndexList(stale, [QModelIndex()] * len(stale))
+        self._df = df
+        self._rebuild_caches()
+        if 0 <= self._sort_column < len(self._visible_columns):
+            self._row_perm = self._sort_positions(self._visible_columns[self._sort_column], self._sort_order)
         self.layoutChanged.emit()
 
 
@@ -139,24 +565,16 @@ class ValueFilterDialog(SlimChecklistDialog):
     """Compact checklist dialog with slim styling for value-based filters."""
 
     def __init__(self, column: str, values: Sequence, parent: QWidget):
-        self._payloads: List = []
-        labels: List[str] = []
-        seen_keys: Set[Tuple[str, str]] = set()
-
-        for raw in values:
-            if pd.isna(raw):
-                key = ("null", "null")
-                payload = NULL_SENTINEL
-                display = "(vazio)"
-            else:
-                display = str(raw)
-                payload = raw
-                key = (type(raw).__name__, display)
-            if key in seen_keys:
-                continue
-            seen_keys.add(key)
-            labels.append(display)
-            self._payloads.append(payload)
+        series = pd.Series(values)
+        present = _unique_display(series)
+        if len(present) > FILTER_VALUES_LIMIT:
+            labels, self._payloads = self._most_frequent(series)
+        else:
+            self._payloads: List = list(present)
+            labels: List[str] = [str(value) for value in present]
+            if series.isna().any():
+                labels.insert(0, "(vazio)")
+                self._payloads.insert(0, NULL_SENTINEL)
 
         if not labels:
             labels.append("(sem valores disponiveis)")
@@ -166,7 +584,6 @@ class ValueFilterDialog(SlimChecklistDialog):
             title=f"Filtrar por valores - {column}",
             items=labels,
             parent=parent,
-            checked_items=list(labels),
             geometry_key="PowerBISummarizer/dialogs/valueFilter",
             header_text=f"Selecione os valores que deseja manter em '{column}'",
             search_placeholder="Buscar valores...",
@@ -176,6 +593,29 @@ class ValueFilterDialog(SlimChecklistDialog):
         )
         self.set_focus_on_search()
 
+    @staticmethod
+    def _most_frequent(series: pd.Series) -> Tuple[List[str], List]:
+        """Top values by frequency plus one entry for everything else."""
+        counts = series.value_counts(dropna=False)
+        counts = counts[counts > 0].head(FILTER_VALUES_LIMIT)
+        labels: List[str] = []
+        payloads: List = []
+        listed: List = []
+        nulls_listed = False
+        missing = counts.index.isna()
+        for is_missing, value, count in zip(missing, counts.index, counts.to_numpy()):
+            if is_missing:
+                nulls_listed = True
+                labels.append(f"(vazio) ({count})")
+                payloads.append(NULL_SENTINEL)
+            else:
+                listed.append(value)
+                labels.append(f"{value} ({count})")
+                payloads.append(value)
+        labels.append("(outros...)")
+        payloads.append(_OtherValues(listed, include_missing=not nulls_listed))
+        return labels, payloads
+
     def selected_values(self) -> List:
         indices = super().selected_indices()
         return [self._payloads[i] for i in indices if 0 <= i < len(self._payloads)]
@@ -189,12 +629,25 @@ class PowerQueryTable(QWidget):
 
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
-        self._protected_columns: Set[str] = set(PROTECTED_COLUMNS_DEFAULT)
+        self._protected_columns: FrozenSet[str] = frozenset(PROTECTED_COLUMNS_DEFAULT)
         self._base_df = pd.DataFrame()
         self._transformed_df = pd.DataFrame()
         self._filtered_df = pd.DataFrame()
         self._geometry_available = True
         self._active_filters: Dict[str, List] = {}
+        self._protected_mask: np.ndarray = np.zeros(0, dtype=bool)
+        self._visible_user_cols_cache: List[str] = []
+        self._columns_set: Optional[Set[str]] = None
+        self._unique_cache: Dict[str, Tuple[List, bool]] = {}
+        # Positions in _transformed_df of the rows in _filtered_df; None when
+        # no row is filtered out.
+        self._filtered_positions: Optional[np.ndarray] = None
+        self._last_resize_signature: Optional[Tuple[int, Tuple[str, ...]]] = None
+        self._filter_ticket = 0
+        self._filter_signals = _FilterSignals(self)
+        self._filter_signals.finished.connect(self._on_filter_done)
+        self._badge_pool: List[Tuple[QFrame, QLabel]] = []
+        self._badge_columns: List[str] = []
         self._model = PowerQueryModel(pd.DataFrame(), self)
         self._materialize_callback: Optional[Callable[[pd.DataFrame, bool], None]] = None
 
@@ -364,67 +817,10 @@ class PowerQueryTable(QWidget):
         header.setContextMenuPolicy(Qt.CustomContextMenu)
         header.customContextMenuRequested.connect(self._show_header_menu)
         header.setHighlightSections(False)
+        # Measure column widths from a bounded number of rows.
+        header.setResizeContentsPrecision(200)
 
-        self.view.setStyleSheet(
-            """
-            QFrame#pqRibbon {
-                background-color: #ffffff;
-                border: 1px solid #dfe3ec;
-                border-radius: 0px;
-            }
-            QSplitter#pqSplitter::handle {
-                background-color: #dfe3ec;
-                width: 4px;
-            }
-            QFrame#filterPanel {
-                background-color: #ffffff;
-                border: 1px solid #dfe3ec;
-                border-radius: 0px;
-            }
-            QFrame#tablePanel {
-                background-color: #ffffff;
-                border: 1px solid #dfe3ec;
-                border-radius: 0px;
-                padding: 8px;
-            }
-            QTableView {
-                background-color: #f5f6fa;
-                alternate-background-color: #eef1f8;
-                gridline-color: #d9dce3;
-                selection-background-color: #fff3c2;
-                selection-color: #1d2a4b;
-                border: none;
-            }
-            QTableView::item {
-                padding: 4px 8px;
-            }
-            QHeaderView::section {
-                background-color: #e7ebf5;
-                color: #1d2a4b;
-                font-weight: 600;
-                border: none;
-                border-right: 1px solid #d9dce3;
-                padding: 6px 10px;
-            }
-            QFrame#statusBar {
-                background-color: #ffffff;
-                border-top: 1px solid #dfe3ec;
-            }
-            QFrame#filterBadge {
-                background-color: #f7f9ff;
-                border: 1px solid #d0d8ef;
-                border-radius: 0px;
-            }
-            QFrame#filterBadge QPushButton {
-                border: none;
-                background: transparent;
-                color: #1d2a4b;
-            }
-            QFrame#filterBadge QPushButton:hover {
-                color: #d9534f;
-            }
-            """
-        )
+        self.view.setStyleSheet(_PQ_STYLESHEET)
 
     # ------------------------------------------------------------------ Public API
     def set_dataframe(
@@ -432,35 +828,52 @@ class PowerQueryTable(QWidget):
         df: pd.DataFrame,
         protected_columns: Optional[Sequence[str]] = None,
     ):
-        self._base_df = df.copy()
-        self._transformed_df = df.copy()
-        self._filtered_df = df.copy()
+        self._base_df = df
+        self._transformed_df = df
+        self._filtered_df = df
         self._active_filters.clear()
         if protected_columns is None:
             protected_columns = PROTECTED_COLUMNS_DEFAULT
-        self._protected_columns = set(protected_columns)
-        visible_cols = [c for c in df.columns if c not in self._protected_columns]
-        self._set_transformed_df(df, visible_cols, reset_filters=True)
+        self._protected_columns = frozenset(protected_columns)
+        self._set_transformed_df(df, None, reset_filters=True)
 
     def dataframe(self) -> pd.DataFrame:
-        return self._filtered_df.copy()
+        return self._filtered_df
 
     def geometry_available(self) -> bool:
         return self._geometry_available
 
     # ------------------------------------------------------------------ Internal helpers
-    def _apply_dataframe(self, df: pd.DataFrame, visible: Optional[Sequence[str]] = None):
+    def _apply_dataframe(
+        self,
+        df: pd.DataFrame,
+        visible: Optional[Sequence[str]] = None,
+        rows_only: bool = False,
+        positions: Optional[np.ndarray] = None,
+    ):
+        """Show ``df``; ``positions`` maps its rows into ``_transformed_df`` (None: same rows)."""
+        protected = self._protected_columns
         if visible is None:
             visible = self._model.visible_columns
         if not visible:
-            visible = [c for c in df.columns if c not in self._protected_columns]
-        self._model.set_dataframe(df, visible)
-        self._filtered_df = df.copy()
+            visible = [c for c in df.columns if c not in protected]
+        # Whatever is shown now supersedes a filter still running in the pool.
+        self._filter_ticket += 1
+        if rows_only:
+            self._model.update_rows(df)
+        else:
+            self._model.set_dataframe(df, visible)
+        self._filtered_df = df
+        self._filtered_positions = positions
         row_count = len(df.index)
-        col_count = len([c for c in df.columns if c not in self._protected_columns])
+        # Filters only drop rows, so the transformed frame's columns apply.
+        col_count = int((~self._protected_mask).sum())
         self.status_label.setText(f"{row_count} linha(s)")
         self.summary_label.setText(f"{col_count} coluna(s)")
-        self.view.resizeColumnsToContents()
+        signature = (row_count, tuple(self._model.visible_columns))
+        if signature != self._last_resize_signature:
+            self._last_resize_signature = signature
+            self.view.resizeColumnsToContents()
 
     def _set_transformed_df(
         self,
@@ -468,19 +881,62 @@ class PowerQueryTable(QWidget):
         visible: Optional[Sequence[str]] = None,
         reset_filters: bool = False,
     ):
-        self._transformed_df = df.copy()
+        df = self._arrowize_string_columns(self._categorize_filter_columns(df))
+        self._transformed_df = df
+        protected = self._protected_columns
+        self._protected_mask = np.fromiter(
+            (column in protected for column in df.columns), dtype=bool, count=len(df.columns)
+        )
+        self._visible_user_cols_cache = list(df.columns[~self._protected_mask])
+        self._columns_set = None
+        self._unique_cache.clear()
         self._update_geometry_flag()
         if reset_filters:
             self._active_filters.clear()
         else:
-            to_remove = [col for col in self._active_filters if col not in df.columns]
+            columns = _col_set(df)
+            to_remove = [col for col in self._active_filters if col not in columns]
             for col in to_remove:
                 self._active_filters.pop(col, None)
         if visible is None:
-            visible = [c for c in df.columns if c not in self._protected_columns]
+            visible = self._visible_user_columns()
         self._apply_dataframe(df, visible)
         self._refresh_filter_badges()
 
+    def _categorize_filter_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Store repetitive text columns as categoricals so filters compare codes."""
+        if len(df.index) <= CATEGORY_MIN_ROWS:
+            return df
+        converted = None
+        for column in df.select_dtypes(include="object").columns:
+            if column in self._protected_columns:
+                continue
+            try:
+                unique_count = df[column].nunique(dropna=True)
+            except TypeError:
+                continue
+            if unique_count and unique_count / len(df.index) < CATEGORY_MAX_RATIO:
+                if converted is None:
+                    # The incoming frame may be _base_df, which keeps its dtypes.
+                    converted = df.copy(deep=False)
+                converted[column] = df[column].astype("category")
+        return df if converted is None else converted
+
+    def _arrowize_string_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Back the remaining text columns with Arrow strings for faster .str ops."""
+        if pa is None or not hasattr(pd, "ArrowDtype"):
+            return df
+        converted = None
+        for column in df.select_dtypes(include="object").columns:
+            if column in self._protected_columns:
+                continue
+            if ptypes.infer_dtype(df[column], skipna=True) != "string":
+                continue
+            if converted is None:
+                converted = df.copy(deep=False)
+            converted[column] = df[column].astype(pd.ArrowDtype(pa.string()))
+        return df if converted is None else converted
+
     def _update_geometry_flag(self):
         if "__geometry_wkb" not in self._transformed_df.columns:
             self._geometry_available = False
@@ -489,7 +945,7 @@ class PowerQueryTable(QWidget):
         self._geometry_available = series.notna().any()
 
     def _visible_user_columns(self) -> List[str]:
-        return [c for c in self._transformed_df.columns if c not in self._protected_columns]
+        return self._visible_user_cols_cache
 
     def _format_filter_values(self, values: List) -> str:
         display_values = [_display_text(val) for val in values]
@@ -498,30 +954,34 @@ class PowerQueryTable(QWidget):
         return ", ".join(display_values) if display_values else "Todos"
 
     def _refresh_filter_badges(self):
-        while self.filter_badge_container.count():
-            item = self.filter_badge_container.takeAt(0)
-            widget = item.widget()
-            if widget is not None:
-                widget.deleteLater()
-        if not self._active_filters:
-            self.filter_placeholder.setVisible(True)
-            return
-        self.filter_placeholder.setVisible(False)
-        for column, values in self._active_filters.items():
-            badge = QFrame()
-            badge.setObjectName("filterBadge")
-            badge_layout = QHBoxLayout(badge)
-            badge_layout.setContentsMargins(10, 6, 6, 6)
-            badge_layout.setSpacing(6)
-            label = QLabel(f"{column}: {self._format_filter_values(values)}")
-            label.setWordWrap(True)
-            badge_layout.addWidget(label)
-            clear_btn = QPushButton("x")
-            clear_btn.setFixedSize(18, 18)
-            clear_btn.clicked.connect(lambda _, col=column: self._remove_filter(col))
-            badge_layout.addWidget(clear_btn, 0, Qt.AlignTop)
-            self.filter_badge_container.addWidget(badge, 0, Qt.AlignTop)
-        self.filter_badge_container.addStretch()
+        self.filter_placeholder.setVisible(not self._active_filters)
+        self._badge_columns = list(self._active_filters)
+        while len(self._badge_pool) < len(self._badge_columns):
+            self._badge_pool.append(self._create_filter_badge(len(self._badge_pool)))
+        for position, (badge, label) in enumerate(self._badge_pool):
+            if position < len(self._badge_columns):
+                column = self._badge_columns[position]
+                label.setText(f"{column}: {self._format_filter_values(self._active_filters[column])}")
+                badge.setVisible(True)
+            else:
+                badge.setVisible(False)
+
+    def _create_filter_badge(self, position: int) -> Tuple[QFrame, QLabel]:
+        badge = QFrame()
+        badge.setObjectName("filterBadge")
+        badge_layout = QHBoxLayout(badge)
+        badge_layout.setContentsMargins(10, 6, 6, 6)
+        badge_layout.setSpacing(6)
+        label = QLabel()
+        label.setWordWrap(True)
+        badge_layout.addWidget(label)
+        clear_btn = QPushButton("x")
+        clear_btn.setFixedSize(18, 18)
+        # Badges are reused, so the button looks up its column when clicked.
+        clear_btn.clicked.connect(lambda _, pos=position: self._remove_filter(self._badge_columns[pos]))
+        badge_layout.addWidget(clear_btn, 0, Qt.AlignTop)
+        self.filter_badge_container.addWidget(badge, 0, Qt.AlignTop)
+        return badge, label
 
     def _remove_filter(self, column: str):
         if column in self._active_filters:
@@ -529,20 +989,36 @@ class PowerQueryTable(QWidget):
             self._apply_filters()
 
     def _apply_filters(self):
-        df = self._transformed_df.copy()
-        for column, values in self._active_filters.items():
-            if column not in df.columns:
-                continue
-            series = df[column]
-            allowed_values = [val for val in values if val is not NULL_SENTINEL]
-            mask = pd.Series(True, index=df.index)
-            if allowed_values:
-                mask &= series.isin(allowed_values)
-            if any(val is NULL_SENTINEL for val in values):
-                mask |= series.isna()
-            df = df[mask]
-        self._apply_dataframe(df, self._model.visible_columns)
+        source = self._transformed_df
         self._refresh_filter_badges()
+        if len(source.index) < FILTER_ASYNC_MIN_ROWS:
+            self._show_filtered(source, _filter_mask(source, self._active_filters))
+            return
+        # Large frames are filtered off the GUI thread; any newer update
+        # bumps the ticket so a late result is simply dropped.
+        self._filter_ticket += 1
+        filters = {column: list(values) for column, values in self._active_filters.items()}
+        task = _FilterTask(self._filter_ticket, source, filters, self._filter_signals)
+        self.status_label.setText("Filtrando...")
+        QThreadPool.globalInstance().start(task)
+
+    def _on_filter_done(self, ticket: int, result):
+        if ticket != self._filter_ticket:
+            return
+        if isinstance(result, Exception):
+            QMessageBox.warning(self, "Filtros", f"Nao foi possivel aplicar os filtros: {result}")
+            self._apply_dataframe(
+                self._filtered_df, self._model.visible_columns, positions=self._filtered_positions
+            )
+            return
+        self._show_filtered(self._transformed_df, result)
+
+    def _show_filtered(self, source: pd.DataFrame, mask: np.ndarray):
+        if mask.all():
+            self._apply_dataframe(source, rows_only=True)
+            return
+        positions = np.flatnonzero(mask)
+        self._apply_dataframe(source.iloc[positions], rows_only=True, positions=positions)
 
     def _ensure_column_available(self, column: str) -> bool:
         if column not in self._transformed_df.columns:
@@ -553,13 +1029,26 @@ class PowerQueryTable(QWidget):
             return False
         return True
 
+    def _column_unique(self, column: str) -> Tuple[List, bool]:
+        """Distinct values of a transformed column and whether it has gaps."""
+        cached = self._unique_cache.get(column)
+        if cached is None:
+            series = self._transformed_df[column]
+            cached = (list(_unique_display(series)), bool(series.isna().any()))
+            self._unique_cache[column] = cached
+        return cached
+
     def _unique_column_name(self, base_name: str) -> str:
+        if self._columns_set is None:
+            self._columns_set = set(self._transformed_df.columns)
+        existing = self._columns_set
         candidate = base_name
         counter = 1
-        existing = set(self._transformed_df.columns)
         while candidate in existing:
             counter += 1
             candidate = f"{base_name}_{counter}"
+        # Reserve the name: the caller is about to add this column.
+        existing.add(candidate)
         return candidate
 
     # ------------------------------------------------------------------ Command bar actions
@@ -587,8 +1076,9 @@ class PowerQueryTable(QWidget):
         if not selected:
             QMessageBox.warning(self, "Colunas", "Selecione ao menos uma coluna.")
             return
-        visible = [c for c in selected if c in self._transformed_df.columns]
-        self._apply_dataframe(self._filtered_df, visible)
+        columns = _col_set(self._transformed_df)
+        visible = [c for c in selected if c in columns]
+        self._apply_dataframe(self._filtered_df, visible, positions=self._filtered_positions)
 
     def _remove_columns_command(self):
         columns = self._visible_user_columns()
@@ -613,8 +1103,10 @@ class PowerQueryTable(QWidget):
         selected = dialog.selected_labels()
         if not selected:
             return
-        df = self._transformed_df.drop(columns=[c for c in selected if c in self._transformed_df.columns])
-        visible = [c for c in self._model.visible_columns if c in df.columns]
+        columns = _col_set(self._transformed_df)
+        df = self._transformed_df.drop(columns=[c for c in selected if c in columns])
+        remaining = _col_set(df)
+        visible = [c for c in self._model.visible_columns if c in remaining]
         self._set_transformed_df(df, visible, reset_filters=True)
 
     def _split_column_command(self):
@@ -647,14 +1139,13 @@ class PowerQueryTable(QWidget):
 
     def _clear_filters(self):
         if not self._active_filters:
-            self._apply_dataframe(self._transformed_df, self._model.visible_columns)
+            self._apply_dataframe(self._transformed_df, rows_only=True)
             return
         self._active_filters.clear()
         self._apply_filters()
 
     def _revert_to_base(self):
-        visible = [c for c in self._base_df.columns if c not in self._protected_columns]
-        self._set_transformed_df(self._base_df, visible, reset_filters=True)
+        self._set_transformed_df(self._base_df, None, reset_filters=True)
 
     def _refresh_preview(self):
         self._apply_dataframe(self._transformed_df, self._model.visible_columns)
@@ -766,12 +1257,9 @@ class PowerQueryTable(QWidget):
         index = self.view.indexAt(pos)
         if not index.isValid():
             return
-        row = index.row()
+        row = self._model.source_row(index.row())
         column = self._model.visible_columns[index.column()]
-        try:
-            value = self._filtered_df.iloc[row][column]
-        except Exception:
-            value = None
+        value = self._model.raw_value(index)
 
         menu = QMenu(self)
         menu.addAction("Copiar valor", lambda: self._copy_value(value))
@@ -800,9 +1288,19 @@ class PowerQueryTable(QWidget):
     def _copy_column(self, column: str):
         if column not in self._filtered_df.columns:
             return
+        series = self._filtered_df[column]
         clipboard: QClipboard = QGuiApplication.clipboard()
-        text = "\n".join("" if pd.isna(v) else str(v) for v in self._filtered_df[column])
-        clipboard.setText(text)
+        if pc is not None and _is_arrow_dtype(series.dtype) and pa.types.is_string(series.dtype.pyarrow_dtype):
+            # Arrow strings convert straight to Python str with gaps filled.
+            clipboard.setText("\n".join(pc.fill_null(pa.array(series), "").to_pylist()))
+            return
+        if ptypes.is_datetime64_any_dtype(series.dtype):
+            # astype(str) drops the time of midnight timestamps; keep str(Timestamp).
+            values = np.array([str(v) for v in series.to_numpy(dtype=object)], dtype=object)
+        else:
+            values = series.astype(str).to_numpy(dtype=object)
+        values[series.isna().to_numpy()] = ""
+        clipboard.setText("\n".join(values.tolist()))
 
     def _remove_column(self, column: str):
         if not self._ensure_column_available(column):
@@ -814,17 +1312,15 @@ class PowerQueryTable(QWidget):
     def _remove_other_columns(self, column: str):
         if not self._ensure_column_available(column):
             return
-        keep = [c for c in self._transformed_df.columns if c in self._protected_columns or c == column]
-        df = self._transformed_df[keep].copy()
-        visible = [c for c in df.columns if c not in self._protected_columns]
-        self._set_transformed_df(df, visible, reset_filters=True)
+        protected = self._protected_columns
+        keep = [c for c in self._transformed_df.columns if c in protected or c == column]
+        self._set_transformed_df(self._transformed_df[keep], None, reset_filters=True)
 
     def _duplicate_column(self, column: str):
         if column not in self._transformed_df.columns:
             return
         new_name = self._unique_column_name(f"{column}_copia")
-        df = self._transformed_df.copy()
-        df[new_name] = df[column]
+        df = _with_column(self._transformed_df, new_name, self._transformed_df[column])
         visible = list(self._model.visible_columns)
         if column in visible:
             insert_index = visible.index(column) + 1
@@ -845,19 +1341,20 @@ class PowerQueryTable(QWidget):
         )
         if not ok or not option:
             return
-        df = self._transformed_df.copy()
-        base_series = df[column]
+        base_series = self._transformed_df[column]
+        if ptypes.infer_dtype(base_series, skipna=False) != "string":
+            base_series = base_series.astype(str)
         if option == "Maiusculas":
-            new_series = base_series.astype(str).str.upper()
+            new_series = base_series.str.upper()
             suffix = "upper"
         elif option == "Minusculas":
-            new_series = base_series.astype(str).str.lower()
+            new_series = base_series.str.lower()
             suffix = "lower"
         else:
-            new_series = base_series.astype(str).str.len()
+            new_series = base_series.str.len()
             suffix = "len"
         new_name = self._unique_column_name(f"{column}_{suffix}")
-        df[new_name] = new_series
+        df = _with_column(self._transformed_df, new_name, new_series)
         visible = list(self._model.visible_columns)
         if column in visible:
             visible.insert(visible.index(column) + 1, new_name)
@@ -868,35 +1365,52 @@ class PowerQueryTable(QWidget):
     def _remove_duplicates(self, column: str):
         if column not in self._transformed_df.columns:
             return
-        df = self._transformed_df.drop_duplicates(subset=[column])
+        series = self._transformed_df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            keep = ~series.cat.codes.duplicated().to_numpy()
+            df = self._transformed_df.iloc[keep]
+        elif pc is not None and _is_arrow_dtype(series.dtype):
+            # First occurrence of each distinct value, found by Arrow's hash kernels.
+            values = pa.array(series)
+            if isinstance(values, pa.ChunkedArray):
+                values = values.combine_chunks()
+            first = pc.index_in(pc.unique(values), value_set=values, skip_nulls=False)
+            df = self._transformed_df.iloc[np.sort(first.to_numpy(zero_copy_only=False))]
+        else:
+            df = self._transformed_df.drop_duplicates(subset=[column])
         self._set_transformed_df(df, self._model.visible_columns, reset_filters=True)
 
     def _remove_errors(self, column: str):
         if column not in self._transformed_df.columns:
             return
         series = self._transformed_df[column]
-        mask = ~series.isna()
-        if series.dtype == object:
-            mask &= series.astype(str).str.strip().ne("")
-        df = self._transformed_df[mask]
+        mask = series.notna().to_numpy(dtype=bool)
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            blank_codes = np.flatnonzero(_blank_strings(pd.Series(series.cat.categories)))
+            if len(blank_codes):
+                mask &= ~np.isin(series.cat.codes.to_numpy(), blank_codes)
+        elif series.dtype == object or _is_arrow_dtype(series.dtype):
+            mask &= ~_blank_strings(series)
+        df = self._transformed_df.iloc[mask]
         self._set_transformed_df(df, self._model.visible_columns, reset_filters=True)
 
     def _change_type(self, column: str, target: str):
         if column not in self._transformed_df.columns:
             return
-        df = self._transformed_df.copy()
+        series = _plain_values(self._transformed_df[column])
         try:
             if target == "text":
-                df[column] = df[column].astype(str)
+                series = series.astype(str)
             elif target == "int":
-                df[column] = pd.to_numeric(df[column], errors="coerce").astype("Int64")
+                series = _convert_by_unique(series, lambda s: pd.to_numeric(s, errors="coerce")).astype("Int64")
             elif target == "float":
-                df[column] = pd.to_numeric(df[column], errors="coerce")
+                series = _convert_by_unique(series, lambda s: pd.to_numeric(s, errors="coerce"))
             elif target == "date":
-                df[column] = pd.to_datetime(df[column], errors="coerce")
+                series = _convert_by_unique(series, lambda s: pd.to_datetime(s, errors="coerce", cache=True))
         except Exception as exc:
             QMessageBox.warning(self, "Alterar tipo", f"Nao foi possivel converter os valores: {exc}")
             return
+        df = _with_column(self._transformed_df, column, series)
         self._set_transformed_df(df, self._model.visible_columns, reset_filters=False)
 
     def _replace_values(self, column: str):
@@ -908,8 +1422,8 @@ class PowerQueryTable(QWidget):
         new_value, ok = slim_get_text(self, "Substituir valores", "Novo valor:")
         if not ok:
             return
-        df = self._transformed_df.copy()
-        df[column] = df[column].replace(old_value, new_value)
+        replaced = _plain_values(self._transformed_df[column]).replace(old_value, new_value)
+        df = _with_column(self._transformed_df, column, replaced)
         self._set_transformed_df(df, self._model.visible_columns, reset_filters=False)
 
     def _split_column_delimiter(self, column: str):
@@ -918,18 +1432,13 @@ class PowerQueryTable(QWidget):
         delimiter, ok = slim_get_text(self, "Dividir coluna", "Informe o delimitador:", text=",")
         if not ok or delimiter == "":
             return
-        df = self._transformed_df.copy()
-        split_df = (
-            df[column]
-            .astype(str)
-            .str.split(delimiter, expand=True)
-            .replace({None: "", "None": ""})
-        )
-        new_columns = []
-        for idx in range(split_df.shape[1]):
-            new_name = self._unique_column_name(f"{column}_part{idx + 1}")
-            df[new_name] = split_df[idx].str.strip()
-            new_columns.append(new_name)
+        source = self._transformed_df[column]
+        text = source.astype(str).mask(source.isna(), "")
+        split_df = text.str.split(delimiter, expand=True).fillna("")
+        new_columns = [self._unique_column_name(f"{column}_part{idx + 1}") for idx in range(split_df.shape[1])]
+        split_df = split_df.apply(lambda part: part.str.strip())
+        split_df.columns = new_columns
+        df = pd.concat([self._transformed_df, split_df], axis=1)
         visible = list(self._model.visible_columns)
         insert_at = visible.index(column) + 1 if column in visible else len(visible)
         for offset, name in enumerate(new_columns):
@@ -943,13 +1452,13 @@ class PowerQueryTable(QWidget):
         if not ok:
             return
         df = self._transformed_df.copy()
-        series = df[column].fillna("").astype(str)
-        chunks = series.apply(lambda text: [text[i : i + size] for i in range(0, len(text), size)])
-        max_parts = chunks.apply(len).max()
+        series = _plain_values(df[column]).fillna("").astype(str)
+        longest = series.str.len().max()
+        max_parts = 0 if pd.isna(longest) else int((longest + size - 1) // size)
         new_columns = []
         for idx in range(max_parts):
             new_name = self._unique_column_name(f"{column}_chunk{idx + 1}")
-            df[new_name] = chunks.apply(lambda parts, index=idx: parts[index] if index < len(parts) else "")
+            df[new_name] = series.str.slice(idx * size, (idx + 1) * size)
             new_columns.append(new_name)
         visible = list(self._model.visible_columns)
         insert_at = visible.index(column) + 1 if column in visible else len(visible)
@@ -969,28 +1478,41 @@ class PowerQueryTable(QWidget):
         )
         if not ok:
             return
-        df = self._transformed_df.copy()
-        numeric_cols = [c for c in df.columns if ptypes.is_numeric_dtype(df[c]) and c not in self._protected_columns]
-        group = df.groupby(column, dropna=False)
+        df = self._transformed_df
+        numeric_cols = [c for c in self._visible_user_columns() if ptypes.is_numeric_dtype(df[c])]
+        group = df.groupby(column, dropna=False, observed=True)
         if choice == "Contagem":
             result = group.size().reset_index(name="contagem")
         elif choice == "Soma":
             if not numeric_cols:
                 QMessageBox.warning(self, "Agrupar por", "Nao ha colunas numericas para somar.")
                 return
-            result = group[numeric_cols].sum(min_count=1).reset_index()
+            # min_count only matters when a group could be all-NaN.
+            has_nan = bool(df[numeric_cols].isna().to_numpy().any())
+            kwargs = {"min_count": 1} if has_nan else {}
+            result = self._grouped_aggregate(group[numeric_cols], "sum", len(df.index), **kwargs).reset_index()
         else:
             if not numeric_cols:
                 QMessageBox.warning(self, "Agrupar por", "Nao ha colunas numericas para calcular a media.")
                 return
-            result = group[numeric_cols].mean(numeric_only=True).reset_index()
-        self._set_transformed_df(result, [c for c in result.columns if c not in self._protected_columns], reset_filters=True)
+            result = self._grouped_aggregate(group[numeric_cols], "mean", len(df.index)).reset_index()
+        self._set_transformed_df(result, None, reset_filters=True)
+
+    @staticmethod
+    def _grouped_aggregate(grouped, func: str, row_count: int, **kwargs):
+        """Run a groupby reduction, through pandas' numba engine on large frames."""
+        if njit is not None and row_count >= GROUPBY_NUMBA_MIN_ROWS:
+            try:
+                return getattr(grouped, func)(engine="numba", engine_kwargs={"parallel": True}, **kwargs)
+            except Exception:
+                # Nullable/extension columns and older pandas lack the engine.
+                pass
+        return getattr(grouped, func)(numeric_only=True, **kwargs)
 
     def _fill_down(self, column: str):
         if column not in self._transformed_df.columns:
             return
-        df = self._transformed_df.copy()
-        df[column] = df[column].ffill()
+        df = _with_column(self._transformed_df, column, self._transformed_df[column].ffill())
         self._set_transformed_df(df, self._model.visible_columns, reset_filters=False)
 
     def _unpivot_columns(self):
@@ -1016,18 +1538,22 @@ class PowerQueryTable(QWidget):
         value_columns = dialog.selected_labels()
         if not value_columns:
             return
-        id_columns = [c for c in self._transformed_df.columns if c not in value_columns]
+        value_set = set(value_columns)
+        id_columns = [c for c in self._transformed_df.columns if c not in value_set]
         try:
             melted = self._transformed_df.melt(
                 id_vars=id_columns,
                 value_vars=value_columns,
                 var_name="coluna",
                 value_name="valor",
+                ignore_index=True,
             )
+            # One label per source column, repeated for every row.
+            melted["coluna"] = melted["coluna"].astype("category")
         except Exception as exc:
             QMessageBox.warning(self, "Unpivot", f"Nao foi possivel transformar as colunas: {exc}")
             return
-        self._set_transformed_df(melted, [c for c in melted.columns if c not in self._protected_columns], reset_filters=True)
+        self._set_transformed_df(melted, None, reset_filters=True)
 
     def _pivot_columns(self, column: str):
         if column not in self._transformed_df.columns:
@@ -1063,17 +1589,16 @@ class PowerQueryTable(QWidget):
                 values=value_col,
                 aggfunc=agg_map[agg_choice],
                 fill_value=0,
+                observed=True,
             ).reset_index()
         except Exception as exc:
             QMessageBox.warning(self, "Pivot", f"Nao foi possivel realizar o pivot: {exc}")
             return
-        flat_columns = []
-        for col in table.columns:
-            if isinstance(col, tuple):
-                col = "_".join(str(part) for part in col if part not in ("", None))
-            flat_columns.append(str(col))
-        table.columns = flat_columns
-        self._set_transformed_df(table, [c for c in table.columns if c not in self._protected_columns], reset_filters=True)
+        if isinstance(table.columns, pd.MultiIndex):
+            table.columns = ["_".join(str(part) for part in col if part not in ("", None)) for col in table.columns]
+        else:
+            table.columns = table.columns.astype(str)
+        self._set_transformed_df(table, None, reset_filters=True)
 
     def _rename_column(self, column: str):
         if column not in self._transformed_df.columns:
@@ -1084,21 +1609,21 @@ class PowerQueryTable(QWidget):
         if new_name in self._transformed_df.columns:
             QMessageBox.warning(self, "Renomear coluna", "Ja existe uma coluna com esse nome.")
             return
-        df = self._transformed_df.copy()
-        df = df.rename(columns={column: new_name})
+        df = self._transformed_df.rename(columns={column: new_name})
         visible = [new_name if c == column else c for c in self._model.visible_columns]
         self._set_transformed_df(df, visible, reset_filters=False)
 
     def _move_column(self, column: str, offset: int):
         if column not in self._transformed_df.columns:
             return
-        columns = list(self._transformed_df.columns)
-        index = columns.index(column)
-        new_index = max(0, min(len(columns) - 1, index + offset))
+        index = self._transformed_df.columns.get_loc(column)
+        new_index = max(0, min(len(self._transformed_df.columns) - 1, index + offset))
         if index == new_index:
             return
-        columns.insert(new_index, columns.pop(index))
-        df = self._transformed_df[columns]
+        order = list(range(len(self._transformed_df.columns)))
+        order.insert(new_index, order.pop(index))
+        df = self._transformed_df.iloc[:, order]
+        columns = _col_set(df)
         visible = [c for c in self._model.visible_columns if c in columns]
         if column in visible:
             vidx = visible.index(column)
@@ -1108,13 +1633,14 @@ class PowerQueryTable(QWidget):
 
     def _copy_value(self, value):
         clipboard: QClipboard = QGuiApplication.clipboard()
-        clipboard.setText("" if pd.isna(value) else str(value))
+        clipboard.setText(_fast_na_str(value))
 
     def _copy_row(self, row: int):
         if self._filtered_df.empty or row >= len(self._filtered_df.index):
             return
-        series = self._filtered_df.iloc[row]
-        text = "\t".join("" if pd.isna(series[col]) else str(series[col]) for col in self._model.visible_columns if col in series.index)
+        values = self._model.row_values(row)
+        missing = np.asarray(pd.isna(values), dtype=bool)
+        text = "\t".join("" if gap else str(value) for gap, value in zip(missing, values))
         clipboard: QClipboard = QGuiApplication.clipboard()
         clipboard.setText(text)
 
@@ -1131,13 +1657,12 @@ class PowerQueryTable(QWidget):
     def _exclude_value(self, column: str, value):
         if column not in self._transformed_df.columns:
             return
-        series = self._transformed_df[column]
+        unique_values, has_missing = self._column_unique(column)
         if value is None or pd.isna(value):
-            self._active_filters[column] = [val for val in series.dropna().unique().tolist()]
+            self._active_filters[column] = list(unique_values)
         else:
-            unique_values = series.dropna().unique().tolist()
             selection = [val for val in unique_values if val != value]
-            if series.isna().any():
+            if has_missing:
                 selection.append(NULL_SENTINEL)
             self._active_filters[column] = selection
         self._apply_filters()
@@ -1145,7 +1670,11 @@ class PowerQueryTable(QWidget):
     def _remove_rows(self, rows: List[int]):
         if not rows or self._filtered_df.empty:
             return
-        indexes = self._filtered_df.iloc[rows].index
-        df = self._transformed_df.drop(index=indexes, errors="ignore")
+        positions = np.asarray(rows, dtype=np.intp)
+        if self._filtered_positions is not None:
+            positions = self._filtered_positions[positions]
+        keep = np.ones(len(self._transformed_df.index), dtype=bool)
+        keep[positions] = False
+        df = self._transformed_df.iloc[keep]
         self._set_transformed_df(df, self._model.visible_columns, reset_filters=True)
 
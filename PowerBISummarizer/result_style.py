@@ -1,7 +1,5 @@
 
-# Helper para aplicar o CSS/typografia Montserrat dentro do HTML renderizado em QTextBrowser
-def apply_result_style(html: str) -> str:
-    base = """
+_RESULT_STYLE_CSS = """
     <style>
     @font-face {
       font-family: 'MontserratCustom';
@@ -19,4 +17,8 @@ def apply_result_style(html: str) -> str:
     th { color: #153C8A; font-weight:600; }
     </style>
     """
-    return base + html
+
+
+# Helper para aplicar o CSS/typografia Montserrat dentro do HTML renderizado em QTextBrowser
+def apply_result_style(html: str) -> str:
+    return _RESULT_STYLE_CSS + html
@@ -1,9 +1,10 @@
 ﻿from __future__ import annotations
 
-from typing import Iterable, List, Optional, Sequence, Tuple
+import weakref
+from typing import Callable, Iterable, List, Optional, Sequence, Set, Tuple
 
-from qgis.PyQt.QtCore import QByteArray, QSettings, Qt
-from qgis.PyQt.QtGui import QFont
+from qgis.PyQt.QtCore import QByteArray, QSettings, QSize, QSortFilterProxyModel, Qt, QTimer
+from qgis.PyQt.QtGui import QFont, QStandardItem, QStandardItemModel
 from qgis.PyQt.QtWidgets import (
     QAbstractItemView,
     QComboBox,
@@ -12,10 +13,10 @@ from qgis.PyQt.QtWidgets import (
     QHBoxLayout,
     QLabel,
     QLineEdit,
-    QListWidget,
-    QListWidgetItem,
+    QListView,
     QPushButton,
     QSpinBox,
+    QStyledItemDelegate,
     QVBoxLayout,
     QWidget,
 )
@@ -33,6 +34,9 @@ QLabel[sublabel="true"] {
     color: #374151;
     font-weight: 600;
 }
+QLabel[feedback="true"] {
+    color: #B91C1C;
+}
 QLineEdit, QComboBox, QSpinBox {
     border: 1px solid #E5E7EB;
     border-radius: 0px;
@@ -74,18 +78,18 @@ QPushButton#SlimPrimaryButton {
 QPushButton#SlimPrimaryButton:hover {
     background-color: #F7D94F;
 }
-QListWidget {
+QListView {
     border: 1px solid #E5E7EB;
     border-radius: 0px;
     padding: 4px;
     alternate-background-color: #F9FAFB;
     font-size: 11.5px;
 }
-QListWidget::item {
+QListView::item {
     height: 26px;
     padding: 0 6px;
 }
-QListWidget::item:selected {
+QListView::item:selected {
     background-color: rgba(242, 200, 17, 0.25);
     color: #111827;
 }
@@ -114,25 +118,33 @@ QScrollBar::sub-line:vertical {
 class SlimDialogBase(QDialog):
     """Applies slim Power BI-inspired styling plus geometry persistence."""
 
+    _cached_font: Optional[QFont] = None
+
     def __init__(self, parent: Optional[QWidget] = None, geometry_key: str = ""):
         super().__init__(parent)
         self._geometry_key = geometry_key
         self._settings = QSettings()
+        self._restored_geometry: Optional[QByteArray] = None
         self.setObjectName("SlimDialog")
         self.setModal(True)
+        self.setFont(self._resolved_font())
+        self.setStyleSheet(SLIM_DIALOG_STYLE)
 
-        font = QFont("Montserrat", 10)
-        if not font.exactMatch():
-            font = QFont("Segoe UI", 10)
-        try:
-            base_size = font.pointSizeF()
-            if base_size <= 0:
+    @classmethod
+    def _resolved_font(cls) -> QFont:
+        if SlimDialogBase._cached_font is None:
+            font = QFont("Montserrat", 10)
+            if not font.exactMatch():
+                font = QFont("Segoe UI", 10)
+            try:
+                base_size = font.pointSizeF()
+                if base_size <= 0:
+                    base_size = 10.0
+            except Exception:
                 base_size = 10.0
-        except Exception:
-            base_size = 10.0
-        font.setPointSizeF(base_size * 1.15)
-        self.setFont(font)
-        self.setStyleSheet(SLIM_DIALOG_STYLE)
+            font.setPointSizeF(base_size * 1.15)
+            SlimDialogBase._cached_font = font
+        return QFont(SlimDialogBase._cached_font)
 
     def showEvent(self, event):
         super().showEvent(event)
@@ -141,13 +153,26 @@ class SlimDialogBase(QDialog):
         data = self._settings.value(self._geometry_key)
         if isinstance(data, QByteArray) and not data.isEmpty():
             self.restoreGeometry(data)
+            self._restored_geometry = self.saveGeometry()
 
     def closeEvent(self, event):
         if self._geometry_key:
-            self._settings.setValue(self._geometry_key, self.saveGeometry())
+            geometry = self.saveGeometry()
+            if geometry != self._restored_geometry:
+                self._settings.setValue(self._geometry_key, geometry)
+                self._restored_geometry = geometry
         super().closeEvent(event)
 
 
+class SlimRowDelegate(QStyledItemDelegate):
+    """Fixed-height rows so the list never measures item text."""
+
+    ROW_HEIGHT = 26
+
+    def sizeHint(self, option, index):
+        return QSize(0, self.ROW_HEIGHT)
+
+
 class SlimChecklistDialog(SlimDialogBase):
     """Generic checklist dialog with search and quick actions."""
 
@@ -164,12 +189,22 @@ class SlimChecklistDialog(SlimDialogBase):
         clear_all_label: str = "Desmarcar todas",
         empty_selection_message: str = "Selecione pelo menos um item antes de continuar.",
         enable_search: bool = True,
+        filter_mode: str = "debounced",
     ):
+        """``filter_mode`` is "debounced" (filter shortly after typing stops) or
+        "on_return" (filter only when Enter is pressed, for very long lists)."""
         super().__init__(parent, geometry_key=geometry_key)
 
-        self._labels: List[str] = list(items)
-        checked_set = set(checked_items) if checked_items is not None else set(self._labels)
+        # Labels are kept by reference; callers must not mutate the list afterwards.
+        self._labels: List[str] = items if isinstance(items, list) else list(items)
+        checked_set = None
+        if checked_items is not None:
+            checked_set = (
+                checked_items if isinstance(checked_items, (set, frozenset)) else set(checked_items)
+            )
         self._empty_selection_message = empty_selection_message
+        self._last_query = ""
+        self._feedback_text = ""
 
         self.setWindowTitle(title)
         self.resize(460, 420)
@@ -205,25 +240,48 @@ class SlimChecklistDialog(SlimDialogBase):
         quick_layout.addStretch(1)
         root.addLayout(quick_layout)
 
-        self.list_widget = QListWidget(self)
-        self.list_widget.setSelectionMode(QAbstractItemView.NoSelection)
-        self.list_widget.setUniformItemSizes(True)
-        self.list_widget.setAlternatingRowColors(True)
-        self.list_widget.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
-        self.list_widget.setAccessibleName("SlimDialogChecklist")
-        root.addWidget(self.list_widget, 1)
-
+        prototype = QStandardItem()
+        prototype.setEditable(False)
+        prototype.setCheckable(True)
+        items: List[QStandardItem] = []
+        self._checked_rows: Set[int] = set()
         for index, label in enumerate(self._labels):
-            item = QListWidgetItem(label or "Item")
-            item.setFlags(item.flags() | Qt.ItemIsUserCheckable | Qt.ItemIsEnabled)
-            state = Qt.Checked if label in checked_set else Qt.Unchecked
-            item.setCheckState(state)
-            item.setData(Qt.UserRole, index)
-            self.list_widget.addItem(item)
+            item = prototype.clone()
+            item.setText(label or "Item")
+            if checked_set is None or label in checked_set:
+                item.setCheckState(Qt.Checked)
+                self._checked_rows.add(index)
+            else:
+                item.setCheckState(Qt.Unchecked)
+            item.setData(index, Qt.UserRole)
+            items.append(item)
+
+        self._items = items
+        self._model = QStandardItemModel(self)
+        self._model.blockSignals(True)
+        if items:
+            self._model.appendColumn(items)
+        self._model.blockSignals(False)
+
+        self._proxy = QSortFilterProxyModel(self)
+        self._proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self._proxy.setFilterRole(Qt.DisplayRole)
+        self._proxy.setDynamicSortFilter(False)
+        self._proxy.setSourceModel(self._model)
+
+        self.list_view = QListView(self)
+        self.list_view.setModel(self._proxy)
+        self.list_view.setItemDelegate(SlimRowDelegate(self.list_view))
+        self.list_view.setSelectionMode(QAbstractItemView.NoSelection)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setAlternatingRowColors(True)
+        self.list_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.list_view.setAccessibleName("SlimDialogChecklist")
+        root.addWidget(self.list_view, 1)
 
         self.feedback_label = QLabel("")
         self.feedback_label.setProperty("sublabel", True)
-        self.feedback_label.setStyleSheet("color: #B91C1C;")
+        self.feedback_label.setProperty("feedback", True)
         self.feedback_label.setVisible(False)
         self.feedback_label.setAccessibleName("SlimDialogFeedback")
         root.addWidget(self.feedback_label)
@@ -238,37 +296,76 @@ class SlimChecklistDialog(SlimDialogBase):
         self.cancel_button.setAccessibleName("SlimDialogCancelAction")
         root.addWidget(button_box)
 
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(150)
+        self._filter_timer.timeout.connect(self._apply_search)
+
         # Connections
-        self.search_field.textChanged.connect(self._filter_items)
-        self.select_all_btn.clicked.connect(lambda: self._set_visible_items_state(Qt.Checked))
-        self.clear_all_btn.clicked.connect(lambda: self._set_visible_items_state(Qt.Unchecked))
-        self.list_widget.itemChanged.connect(lambda _: self._clear_feedback())
+        if filter_mode == "on_return":
+            # Enter filters the list instead of accepting the dialog.
+            self.ok_button.setDefault(False)
+            self.search_field.returnPressed.connect(self._apply_search)
+        else:
+            self.search_field.textChanged.connect(self._filter_timer.start)
+        self.select_all_btn.clicked.connect(self._on_select_all)
+        self.clear_all_btn.clicked.connect(self._on_clear_all)
+        self._model.itemChanged.connect(self._on_item_changed)
         button_box.accepted.connect(self._handle_accept)
         button_box.rejected.connect(self.reject)
 
         if self.search_field.isVisible():
             self.search_field.setFocus(Qt.TabFocusReason)
         else:
-            self.list_widget.setFocus(Qt.TabFocusReason)
+            self.list_view.setFocus(Qt.TabFocusReason)
 
     # ------------------------------------------------------------------ Helpers
+    def _apply_search(self):
+        self._filter_items(self.search_field.text())
+
     def _filter_items(self, text: str):
         query = (text or "").strip().lower()
-        self.list_widget.setUpdatesEnabled(False)
-        for row in range(self.list_widget.count()):
-            item = self.list_widget.item(row)
-            visible = True
-            if query:
-                visible = query in (item.text() or "").lower()
-            item.setHidden(not visible)
-        self.list_widget.setUpdatesEnabled(True)
+        if query == self._last_query:
+            return
+        self._last_query = query
+        if not query and self._proxy.rowCount() == self._model.rowCount():
+            # Nothing is hidden; the previous pattern already accepts every row.
+            return
+        self._proxy.setFilterFixedString(query)
+
+    def _on_item_changed(self, item: QStandardItem):
+        index = int(item.data(Qt.UserRole))
+        if item.checkState() == Qt.Checked:
+            self._checked_rows.add(index)
+        else:
+            self._checked_rows.discard(index)
+        self._clear_feedback()
+
+    def _on_select_all(self):
+        self._set_visible_items_state(Qt.Checked)
+
+    def _on_clear_all(self):
+        self._set_visible_items_state(Qt.Unchecked)
 
     def _set_visible_items_state(self, state: Qt.CheckState):
-        for row in range(self.list_widget.count()):
-            item = self.list_widget.item(row)
-            if item.isHidden():
-                continue
-            item.setCheckState(state)
+        proxy = self._proxy
+        model = self._model
+        map_to_source = proxy.mapToSource
+        proxy_index = proxy.index
+        rows = [map_to_source(proxy_index(row, 0)).row() for row in range(proxy.rowCount())]
+        if not rows:
+            return
+        items = self._items
+        model.blockSignals(True)
+        for row in rows:
+            items[row].setCheckState(state)
+        model.blockSignals(False)
+        model.dataChanged.emit(model.index(min(rows), 0), model.index(max(rows), 0))
+        if state == Qt.Checked:
+            self._checked_rows.update(rows)
+        else:
+            self._checked_rows.difference_update(rows)
+        self._clear_feedback()
 
     def _handle_accept(self):
         if self.selected_indices():
@@ -277,22 +374,19 @@ class SlimChecklistDialog(SlimDialogBase):
         self._show_feedback(self._empty_selection_message)
 
     def _show_feedback(self, message: str):
-        self.feedback_label.setText(message)
-        self.feedback_label.setVisible(True)
+        if message != self._feedback_text:
+            self.feedback_label.setText(message)
+            self._feedback_text = message
+        if not self.feedback_label.isVisible():
+            self.feedback_label.setVisible(True)
 
     def _clear_feedback(self):
         if self.feedback_label.isVisible():
-            self.feedback_label.clear()
             self.feedback_label.setVisible(False)
 
     # ------------------------------------------------------------------ Public API
     def selected_indices(self) -> List[int]:
-        result: List[int] = []
-        for row in range(self.list_widget.count()):
-            item = self.list_widget.item(row)
-            if item.checkState() == Qt.Checked:
-                result.append(int(item.data(Qt.UserRole)))
-        return result
+        return sorted(self._checked_rows)
 
     def selected_labels(self) -> List[str]:
         indices = self.selected_indices()
@@ -303,7 +397,7 @@ class SlimChecklistDialog(SlimDialogBase):
             self.search_field.setFocus(Qt.TabFocusReason)
             self.search_field.selectAll()
         else:
-            self.list_widget.setFocus(Qt.TabFocusReason)
+            self.list_view.setFocus(Qt.TabFocusReason)
 
 
 class SlimLayerSelectionDialog(SlimChecklistDialog):
@@ -332,6 +426,7 @@ class SlimLayerSelectionDialog(SlimChecklistDialog):
                 "empty_selection_message", "Selecione pelo menos uma camada antes de continuar."
             ),
             enable_search=kwargs.pop("enable_search", True),
+            filter_mode=kwargs.pop("filter_mode", "debounced"),
         )
 
 
@@ -351,10 +446,66 @@ def _build_form_dialog(
     ok_button.setObjectName("SlimPrimaryButton")
     ok_button.setDefault(True)
     button_box.addButton("Cancelar", QDialogButtonBox.RejectRole)
+    button_box.accepted.connect(dialog.accept)
+    button_box.rejected.connect(dialog.reject)
     layout.addWidget(button_box)
     return dialog, layout, button_box
 
 
+_reusable_dialogs: "weakref.WeakValueDictionary[Tuple[int, str], SlimDialogBase]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+def _form_dialog(
+    parent: Optional[QWidget],
+    kind: str,
+    title: str,
+    label_text: str,
+    geometry_key: str,
+    create_editor: Callable[[QWidget], QWidget],
+) -> Tuple[SlimDialogBase, QWidget]:
+    """Prompt dialog for ``slim_get_*``, reused per parent and kind while idle."""
+    key = (id(parent), kind)
+    dialog = _reusable_dialogs.get(key) if parent is not None else None
+    if dialog is None or dialog.isVisible() or dialog.parentWidget() is not parent:
+        dialog, layout, _buttons = _build_form_dialog(parent, title, geometry_key)
+        prompt = QLabel(dialog)
+        prompt.setProperty("sublabel", True)
+        prompt.setAccessibleName("SlimDialogPrompt")
+        layout.insertWidget(0, prompt)
+        editor = create_editor(dialog)
+        layout.insertWidget(1, editor)
+        dialog._form_widgets = (prompt, editor)
+        if parent is not None:
+            _reusable_dialogs[key] = dialog
+    else:
+        dialog.setWindowTitle(title)
+        dialog._geometry_key = geometry_key
+        dialog._restored_geometry = None
+    prompt, editor = dialog._form_widgets
+    prompt.setText(label_text)
+    return dialog, editor
+
+
+def _new_combo(dialog: QWidget) -> QComboBox:
+    combo = QComboBox(dialog)
+    combo.setAccessibleName("SlimDialogCombo")
+    return combo
+
+
+def _new_line_edit(dialog: QWidget) -> QLineEdit:
+    field = QLineEdit(dialog)
+    field.setAccessibleName("SlimDialogLineEdit")
+    return field
+
+
+def _new_spin_box(dialog: QWidget) -> QSpinBox:
+    spin = QSpinBox(dialog)
+    spin.setAccessibleName("SlimDialogSpinBox")
+    return spin
+
+
 def slim_get_item(
     parent: Optional[QWidget],
     title: str,
@@ -364,34 +515,17 @@ def slim_get_item(
     editable: bool = False,
     geometry_key: str = "PowerBISummarizer/dialogs/getItem",
 ) -> Tuple[str, bool]:
-    dialog, layout, buttons = _build_form_dialog(parent, title, geometry_key)
-
-    prompt = QLabel(label_text)
-    prompt.setProperty("sublabel", True)
-    prompt.setAccessibleName("SlimDialogPrompt")
-    layout.insertWidget(0, prompt)
+    dialog, combo = _form_dialog(parent, "item", title, label_text, geometry_key, _new_combo)
 
-    combo = QComboBox(dialog)
+    combo.clear()
     combo.setEditable(bool(editable))
     combo.addItems(list(items))
     if items and 0 <= current < len(items):
         combo.setCurrentIndex(current)
-    combo.setAccessibleName("SlimDialogCombo")
-    layout.insertWidget(1, combo)
-
-    result = {"text": "", "accepted": False}
-
-    def accept():
-        result["text"] = combo.currentText()
-        result["accepted"] = True
-        dialog.accept()
-
-    buttons.accepted.connect(accept)
-    buttons.rejected.connect(dialog.reject)
     combo.setFocus(Qt.TabFocusReason)
 
-    accepted = dialog.exec_() == QDialog.Accepted and result["accepted"]
-    return result["text"], accepted
+    accepted = dialog.exec_() == QDialog.Accepted
+    return (combo.currentText() if accepted else ""), accepted
 
 
 def slim_get_text(
@@ -402,33 +536,15 @@ def slim_get_text(
     placeholder: str = "",
     geometry_key: str = "PowerBISummarizer/dialogs/getText",
 ) -> Tuple[str, bool]:
-    dialog, layout, buttons = _build_form_dialog(parent, title, geometry_key)
+    dialog, field = _form_dialog(parent, "text", title, label_text, geometry_key, _new_line_edit)
 
-    prompt = QLabel(label_text)
-    prompt.setProperty("sublabel", True)
-    prompt.setAccessibleName("SlimDialogPrompt")
-    layout.insertWidget(0, prompt)
-
-    field = QLineEdit(dialog)
     field.setText(text)
     field.setPlaceholderText(placeholder)
-    field.setAccessibleName("SlimDialogLineEdit")
-    layout.insertWidget(1, field)
-
-    result = {"text": text, "accepted": False}
-
-    def accept():
-        result["text"] = field.text()
-        result["accepted"] = True
-        dialog.accept()
-
-    buttons.accepted.connect(accept)
-    buttons.rejected.connect(dialog.reject)
     field.setFocus(Qt.TabFocusReason)
     field.selectAll()
 
-    accepted = dialog.exec_() == QDialog.Accepted and result["accepted"]
-    return result["text"], accepted
+    accepted = dialog.exec_() == QDialog.Accepted
+    return (field.text() if accepted else text), accepted
 
 
 def slim_get_int(
@@ -441,31 +557,12 @@ def slim_get_int(
     step: int = 1,
     geometry_key: str = "PowerBISummarizer/dialogs/getInt",
 ) -> Tuple[int, bool]:
-    dialog, layout, buttons = _build_form_dialog(parent, title, geometry_key)
-
-    prompt = QLabel(label_text)
-    prompt.setProperty("sublabel", True)
-    prompt.setAccessibleName("SlimDialogPrompt")
-    layout.insertWidget(0, prompt)
+    dialog, spin = _form_dialog(parent, "int", title, label_text, geometry_key, _new_spin_box)
 
-    spin = QSpinBox(dialog)
     spin.setRange(minimum, maximum)
     spin.setSingleStep(step)
     spin.setValue(value)
-    spin.setAccessibleName("SlimDialogSpinBox")
-    layout.insertWidget(1, spin)
-
-    result = {"value": value, "accepted": False}
-
-    def accept():
-        result["value"] = spin.value()
-        result["accepted"] = True
-        dialog.accept()
-
-    buttons.accepted.connect(accept)
-    buttons.rejected.connect(dialog.reject)
     spin.setFocus(Qt.TabFocusReason)
 
-    accepted = dialog.exec_() == QDialog.Accepted and result["accepted"]
-    return result["value"], accepted
-
+    accepted = dialog.exec_() == QDialog.Accepted
+    return (spin.value() if accepted else value), accepted
@@ -14,19 +14,70 @@ from qgis.PyQt.QtWidgets import (
     QSizePolicy,
     QFrame,
     QStackedWidget,
-    QToolButton,
 )
-from qgis.PyQt.QtCore import Qt
-from qgis.PyQt.QtGui import QIcon, QPixmap
+from qgis.PyQt.QtCore import QSize, Qt
+from qgis.PyQt.QtGui import QIcon, QImage, QPainter, QPixmap, QPixmapCache
+from qgis.PyQt.QtSvg import QSvgRenderer
 from qgis.gui import QgsMapLayerComboBox, QgsFieldComboBox
 from qgis.core import QgsMapLayerProxyModel
 
+_LOGO_PATH = os.path.join(os.path.dirname(__file__), "resources", "icons", "plugin_logo.svg")
+_LOGO_SIZE = 40
+
+
+def _load_logo_pixmap(device_pixel_ratio=1.0):
+    """Header logo rendered straight at 40 px and shared through QPixmapCache."""
+    cache_key = f"PowerBISummarizer/logo/{_LOGO_SIZE}@{device_pixel_ratio:g}"
+    pixmap = QPixmapCache.find(cache_key)
+    if pixmap is not None and not pixmap.isNull():
+        return pixmap
+    renderer = QSvgRenderer(_LOGO_PATH)
+    if not renderer.isValid():
+        return QPixmap()
+    size = renderer.defaultSize()
+    if size.isEmpty():
+        size = QSize(_LOGO_SIZE, _LOGO_SIZE)
+    size = size.scaled(_LOGO_SIZE, _LOGO_SIZE, Qt.KeepAspectRatio)
+    image = QImage(size * device_pixel_ratio, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    painter = QPainter(image)
+    renderer.render(painter)
+    painter.end()
+    image.setDevicePixelRatio(device_pixel_ratio)
+    pixmap = QPixmap.fromImage(image)
+    QPixmapCache.insert(cache_key, pixmap)
+    return pixmap
+
+
+_logo_icon = None
+
+
+def _load_logo_icon():
+    """Window icon shared by every dialog instance."""
+    global _logo_icon
+    if _logo_icon is None:
+        _logo_icon = QIcon(_LOGO_PATH)
+    return _logo_icon
+
+
+_EXPANDING_FIXED = QSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+
+
+def _form_combo(combo):
+    """Applies the shared size policy of the compare form combos."""
+    combo.setSizePolicy(_EXPANDING_FIXED)
+    return combo
+
 
 class Ui_PowerBISummarizerDialog(object):
     def setupUi(self, Dialog):
         Dialog.setObjectName("Dialog")
         Dialog.resize(1200, 800)
         Dialog.setWindowTitle("Power BI Summarizer - QGIS")
+        Dialog.setWindowIcon(_load_logo_icon())
+        Dialog.setWindowFlags(
+            Dialog.windowFlags() | Qt.WindowMinimizeButtonHint | Qt.WindowMaximizeButtonHint
+        )
 
         self.verticalLayout = QVBoxLayout(Dialog)
         self.verticalLayout.setContentsMargins(12, 12, 12, 12)
@@ -40,15 +91,10 @@ class Ui_PowerBISummarizerDialog(object):
         header_layout.setContentsMargins(16, 16, 16, 12)
         header_layout.setSpacing(16)
 
-        logo_path = os.path.join(
-            os.path.dirname(__file__), "resources", "icons", "plugin_logo.svg"
-        )
         self.logo_label = QLabel()
-        logo_pixmap = QPixmap(logo_path)
+        logo_pixmap = _load_logo_pixmap(Dialog.devicePixelRatioF())
         if not logo_pixmap.isNull():
-            self.logo_label.setPixmap(
-                logo_pixmap.scaled(40, 40, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            )
+            self.logo_label.setPixmap(logo_pixmap)
         header_layout.addWidget(self.logo_label, 0, Qt.AlignLeft | Qt.AlignVCenter)
 
         self.title_label = QLabel("Power BI Summarizer")
@@ -56,27 +102,13 @@ class Ui_PowerBISummarizerDialog(object):
         header_layout.addWidget(self.title_label, 0, Qt.AlignLeft | Qt.AlignVCenter)
         header_layout.addStretch()
 
-        self.minimize_btn = QToolButton()
-        self.minimize_btn.setText("Min")
-        self.minimize_btn.setToolTip("Minimizar")
-        self.minimize_btn.setAutoRaise(True)
-        self.minimize_btn.setCursor(Qt.PointingHandCursor)
-        header_layout.addWidget(self.minimize_btn, 0, Qt.AlignRight | Qt.AlignVCenter)
-
-        self.maximize_btn = QToolButton()
-        self.maximize_btn.setText("Max")
-        self.maximize_btn.setToolTip("Maximizar")
-        self.maximize_btn.setAutoRaise(True)
-        self.maximize_btn.setCursor(Qt.PointingHandCursor)
-        header_layout.addWidget(self.maximize_btn, 0, Qt.AlignRight | Qt.AlignVCenter)
-
         self.verticalLayout.addWidget(self.header_widget)
 
         # Progress bar ----------------------------------------------------------
         self.progress_bar = QProgressBar()
+        self.progress_bar.setObjectName("progressMain")
         self.progress_bar.setVisible(False)
-        self.progress_bar.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-        self.progress_bar.setFixedHeight(14)
+        self.progress_bar.setSizePolicy(_EXPANDING_FIXED)
         self.verticalLayout.addWidget(self.progress_bar)
 
         # Central stacked content ----------------------------------------------
@@ -110,29 +142,27 @@ class Ui_PowerBISummarizerDialog(object):
         resultados_layout.setContentsMargins(0, 0, 0, 0)
         resultados_layout.setSpacing(12)
 
+        # Layer row and actions row share one grid: column 1 stretches, the
+        # combo spans columns 1-2 and the dashboard button sits in column 2.
         self.results_header_frame = QFrame()
-        header_layout = QVBoxLayout(self.results_header_frame)
+        header_layout = QGridLayout(self.results_header_frame)
         header_layout.setContentsMargins(16, 16, 16, 8)
-        header_layout.setSpacing(10)
+        header_layout.setVerticalSpacing(10)
+        header_layout.setColumnStretch(1, 1)
 
-        layer_row = QHBoxLayout()
         self.layer_label = QLabel("Camada:")
-        layer_row.addWidget(self.layer_label)
+        header_layout.addWidget(self.layer_label, 0, 0)
         self.layer_combo = QgsMapLayerComboBox()
         self.layer_combo.setFilters(QgsMapLayerProxyModel.VectorLayer)
-        layer_row.addWidget(self.layer_combo, 1)
-        header_layout.addLayout(layer_row)
+        header_layout.addWidget(self.layer_combo, 0, 1, 1, 2)
 
-        actions_row = QHBoxLayout()
         self.auto_update_check = QCheckBox("Atualização automática")
         self.auto_update_check.setChecked(True)
         self.auto_update_check.setProperty("role", "helper")
-        actions_row.addWidget(self.auto_update_check)
-        actions_row.addStretch()
+        header_layout.addWidget(self.auto_update_check, 1, 0, 1, 2, Qt.AlignLeft)
         self.dashboard_btn = QPushButton("Dashboard Interativo")
         self.dashboard_btn.setProperty("variant", "secondary")
-        actions_row.addWidget(self.dashboard_btn)
-        header_layout.addLayout(actions_row)
+        header_layout.addWidget(self.dashboard_btn, 1, 2)
 
         resultados_layout.addWidget(self.results_header_frame)
 
@@ -228,41 +258,31 @@ class Ui_PowerBISummarizerDialog(object):
         camada_origem_label = QLabel("Camada origem")
         camada_origem_label.setToolTip("Selecione a camada que contém os registros de origem.")
         compare_form_layout.addWidget(camada_origem_label, 0, 0)
-        self.compare_source_layer_combo = QgsMapLayerComboBox()
-        self.compare_source_layer_combo.setMinimumHeight(26)
-        self.compare_source_layer_combo.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.compare_source_layer_combo = _form_combo(QgsMapLayerComboBox())
         compare_form_layout.addWidget(self.compare_source_layer_combo, 0, 1)
 
         camada_alvo_label = QLabel("Camada alvo")
         camada_alvo_label.setToolTip("Selecione a camada que receberá a comparação.")
         compare_form_layout.addWidget(camada_alvo_label, 0, 2)
-        self.compare_target_layer_combo = QgsMapLayerComboBox()
-        self.compare_target_layer_combo.setMinimumHeight(26)
-        self.compare_target_layer_combo.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.compare_target_layer_combo = _form_combo(QgsMapLayerComboBox())
         compare_form_layout.addWidget(self.compare_target_layer_combo, 0, 3)
 
         campo_origem_label = QLabel("Campo origem")
         campo_origem_label.setToolTip("Campo da camada de origem usado como chave.")
         compare_form_layout.addWidget(campo_origem_label, 1, 0)
-        self.compare_source_field_combo = QgsFieldComboBox()
-        self.compare_source_field_combo.setMinimumHeight(26)
-        self.compare_source_field_combo.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.compare_source_field_combo = _form_combo(QgsFieldComboBox())
         compare_form_layout.addWidget(self.compare_source_field_combo, 1, 1)
 
         campo_comp_label = QLabel("Campo comparação")
         campo_comp_label.setToolTip("Campo da camada alvo usado para comparar.")
         compare_form_layout.addWidget(campo_comp_label, 1, 2)
-        self.compare_target_field_combo = QgsFieldComboBox()
-        self.compare_target_field_combo.setMinimumHeight(26)
-        self.compare_target_field_combo.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.compare_target_field_combo = _form_combo(QgsFieldComboBox())
         compare_form_layout.addWidget(self.compare_target_field_combo, 1, 3)
 
         campo_retorno_label = QLabel("Campo retorno")
         campo_retorno_label.setToolTip("Campo da camada alvo cujo valor será retornado.")
         compare_form_layout.addWidget(campo_retorno_label, 2, 0)
-        self.compare_return_field_combo = QgsFieldComboBox()
-        self.compare_return_field_combo.setMinimumHeight(26)
-        self.compare_return_field_combo.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.compare_return_field_combo = _form_combo(QgsFieldComboBox())
         compare_form_layout.addWidget(self.compare_return_field_combo, 2, 1)
         compare_form_layout.setColumnStretch(1, 1)
         compare_form_layout.setColumnStretch(3, 1)
@@ -304,7 +324,7 @@ class Ui_PowerBISummarizerDialog(object):
         self.pageIntegracao = QWidget()
         integracao_layout = QVBoxLayout(self.pageIntegracao)
         integracao_layout.setContentsMargins(0, 0, 0, 0)
-        integracao_layout.setSpacing(12)
+        integracao_layout.setSpacing(0)
 
         self.integration_placeholder = QLabel(
             "Integrações externas serão exibidas aqui."
@@ -312,9 +332,7 @@ class Ui_PowerBISummarizerDialog(object):
         self.integration_placeholder.setAlignment(Qt.AlignCenter)
         self.integration_placeholder.setProperty("role", "helper")
 
-        integracao_layout.addStretch()
-        integracao_layout.addWidget(self.integration_placeholder)
-        integracao_layout.addStretch()
+        integracao_layout.addWidget(self.integration_placeholder, 1)
 
         self.stackedWidget.addWidget(self.pageIntegracao)
 